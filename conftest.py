@@ -2,9 +2,69 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the project root and python directory to Python path
 project_root = Path(__file__).parent
 python_dir = project_root / "python"
 
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(python_dir))
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Share one SQLAlchemy engine across the whole test session.
+
+    Pre-opens the pool's connections so the TCP and auth handshakes are
+    paid once up front instead of inside the first tests that need them.
+    """
+    from database import get_db_engine
+
+    engine = get_db_engine()
+    warm = [engine.connect() for _ in range(engine.pool.size())]
+    for connection in warm:
+        connection.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_transaction(monkeypatch):
+    """Run a test inside a single rolled-back transaction.
+
+    Opens one connection with an outer transaction and rebinds the session
+    factory so every session created during the test joins it through a
+    SAVEPOINT. The functions under test commit and roll back as usual, but
+    only the savepoint is affected; the rollback here discards everything,
+    so tests need no cleanup DELETEs and nothing is ever flushed to WAL.
+    """
+    from sqlalchemy.orm import sessionmaker
+
+    import database
+    import database.users
+
+    engine = database.get_db_engine()
+    connection = engine.connect()
+    transaction = connection.begin()
+    factory = sessionmaker(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
+    monkeypatch.setattr(database, "SessionM", factory)
+    monkeypatch.setattr(database.users, "SessionM", factory)
+    yield factory
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def session(db_transaction):
+    """One session per test, bound to the rolled-back transaction.
+
+    Thread it through the database.users functions (they accept an
+    optional session) so a test's calls share a single session instead
+    of each constructing and closing their own.
+    """
+    session = db_transaction()
+    yield session
+    session.close()
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 import psycopg2
 from dotenv import load_dotenv
@@ -22,7 +23,15 @@ SESSION_END_HOUR = int(os.getenv("SESSION_END_HOUR", 17))
 SESSION_START_HOUR = int(os.getenv("SESSION_START_HOUR", 9))
 
 
+@lru_cache(maxsize=None)
 def get_db_engine():
+    """
+    Return the shared SQLAlchemy engine, creating it on first use.
+
+    Memoized so every caller reuses one engine and its connection pool;
+    previously each call built a fresh engine whose pool opened a new TCP
+    connection per query.
+    """
     db_no_pass_url = (
         f"postgresql+psycopg2://{DB_USER}:******@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
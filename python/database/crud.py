@@ -1,3 +1,6 @@
+import time
+from functools import lru_cache
+
 import pandas as pd
 from database import engine
 from sqlalchemy import text
@@ -6,6 +9,26 @@ from tools.logger import get_logger
 current_module_name = __name__
 logger = get_logger(current_module_name)
 
+# The instrument mappings behind these lookups change rarely, but a
+# long-running worker should still pick changes up eventually: every cached
+# call carries a coarse time bucket in its key, so entries expire after
+# _CACHE_TTL_SECONDS, and clear_lookup_caches() drops everything at once
+# (e.g. right after mappings are reloaded).
+_CACHE_TTL_SECONDS = 3600
+
+
+def _ttl_bucket() -> int:
+    """Time bucket appended to cache keys so memoized entries expire."""
+    return int(time.monotonic() // _CACHE_TTL_SECONDS)
+
+
+def clear_lookup_caches() -> None:
+    """Drop all memoized lookup results immediately."""
+    _get_oid_by_symbol.cache_clear()
+    _get_xtb_instrument_id.cache_clear()
+    _get_br_symbol_by_xtb.cache_clear()
+    _get_profile_for_symbol.cache_clear()
+
 
 def get_oid_by_symbol(
     br_symbol: str = None,
@@ -15,16 +38,29 @@ def get_oid_by_symbol(
 ) -> int:
     """
     Get OID (Object ID) by various symbol identifiers.
-    
+
     Args:
         br_symbol: BiznesRadar symbol
         xtb_symbol: XTB platform symbol
         symbol3: First 3 characters of XTB symbol
         xtb_instrument_id: XTB instrument identifier
-        
+
     Returns:
         Object ID if found, None otherwise
     """
+    return _get_oid_by_symbol(
+        br_symbol, xtb_symbol, symbol3, xtb_instrument_id, _ttl_bucket()
+    )
+
+
+@lru_cache(maxsize=1024)
+def _get_oid_by_symbol(
+    br_symbol: str,
+    xtb_symbol: str,
+    symbol3: str,
+    xtb_instrument_id: int,
+    _bucket: int,
+) -> int:
     try:
         if br_symbol:
             query = f'''
@@ -65,19 +101,24 @@ def get_oid_by_symbol(
 def get_xtb_instrument_id(br_symbol: str = None, xtb_symbol: str = None) -> int:
     """
     Get XTB instrument ID by BiznesRadar or XTB symbol.
-    
+
     Args:
         br_symbol: BiznesRadar symbol
         xtb_symbol: XTB platform symbol
-        
+
     Returns:
         XTB instrument ID if found, None otherwise
     """
+    return _get_xtb_instrument_id(br_symbol, xtb_symbol, _ttl_bucket())
+
+
+@lru_cache(maxsize=1024)
+def _get_xtb_instrument_id(br_symbol: str, xtb_symbol: str, _bucket: int) -> int:
     try:
         query = f'''
             SELECT xtb_instrument_id
               FROM raw.xtb2br_map_v
-             WHERE 1=1 
+             WHERE 1=1
         '''
         if br_symbol:
             query += f" AND upper(br_symbol) = upper('{br_symbol}')"
@@ -97,14 +138,19 @@ def get_xtb_instrument_id(br_symbol: str = None, xtb_symbol: str = None) -> int:
 def get_br_symbol_by_xtb(xtb_symbol: str = None, xtb_instrument_id: int = None) -> str:
     """
     Get BiznesRadar symbol by XTB symbol or instrument ID.
-    
+
     Args:
         xtb_symbol: XTB platform symbol
         xtb_instrument_id: XTB instrument identifier
-        
+
     Returns:
         BiznesRadar symbol if found, None otherwise
     """
+    return _get_br_symbol_by_xtb(xtb_symbol, xtb_instrument_id, _ttl_bucket())
+
+
+@lru_cache(maxsize=1024)
+def _get_br_symbol_by_xtb(xtb_symbol: str, xtb_instrument_id: int, _bucket: int) -> str:
     try:
         if not xtb_symbol and not xtb_instrument_id:
             logger.error(
@@ -115,7 +161,7 @@ def get_br_symbol_by_xtb(xtb_symbol: str = None, xtb_instrument_id: int = None)
         query = f'''
             SELECT br_symbol
               FROM raw.xtb2br_map_v
-             WHERE 1=1 
+             WHERE 1=1
         '''
         if xtb_symbol:
             query += f" AND xtb_symbol = '{xtb_symbol}'"
@@ -159,6 +205,13 @@ def get_profile_for_symbol(br_symbol: str = None, instrument_id: int = None) ->
         >>> print(f"Company branch: {profile['branch']}")
         >>> print(f"Market cap: {profile['capitalization']}")
     """
+    profile_data = _get_profile_for_symbol(br_symbol, instrument_id, _ttl_bucket())
+    # Hand out a copy so caller mutations cannot corrupt the cached entry
+    return dict(profile_data) if profile_data is not None else None
+
+
+@lru_cache(maxsize=1024)
+def _get_profile_for_symbol(br_symbol: str, instrument_id: int, _bucket: int) -> dict:
     logger.info(f"Retrieving profile information for symbol {br_symbol}")
 
     try:
@@ -167,7 +220,7 @@ def get_profile_for_symbol(br_symbol: str = None, instrument_id: int = None) ->
             return None
 
         query = '''
-            SELECT p.br_symbol, 
+            SELECT p.br_symbol,
                    p.period_ts,
                    p.branch,
                    p.start_date,
@@ -178,7 +231,7 @@ def get_profile_for_symbol(br_symbol: str = None, instrument_id: int = None) ->
               FROM raw.br_symbol_profile_flat_v p
               join raw.xtb2br_map_v m
                 on p.br_symbol = m.br_symbol
-             where 1=1 
+             where 1=1
             '''
         if br_symbol:
             query += f" AND upper(p.br_symbol) = upper('{br_symbol}')"
@@ -121,8 +121,28 @@ def get_accum_profile_data() -> pd.DataFrame:
 
     
 
+# Full column set produced by both legs of the get_quotes query
+_QUOTE_COLUMNS = (
+    "oid",
+    "instrument_id",
+    "raw_ts",
+    "day_nbr",
+    "ts_dt",
+    "weekday",
+    "min",
+    "max",
+    "open",
+    "close",
+    "volume",
+    "amount",
+)
+
+
 def get_quotes(
-    xtb_instrument_id: int = None, br_symbol: str = None, days_back: int = 10
+    xtb_instrument_id: int = None,
+    br_symbol: str = None,
+    days_back: int = 10,
+    columns: tuple = None,
 ) -> pd.DataFrame:
     """
     Retrieve instrument quotes from the last X days.
@@ -134,7 +154,10 @@ def get_quotes(
         xtb_instrument_id: XTB instrument identifier. If None, br_symbol must be provided.
         br_symbol: Biznes Radar symbol. Used to lookup xtb_instrument_id if not provided.
         days_back: Number of days of historical data to retrieve. Defaults to 10.
-    
+        columns: Optional subset of column names to fetch. Projection happens
+            in SQL, so narrowing here cuts bytes transferred from the DB and
+            pandas construction cost. Defaults to all columns.
+
     Returns:
         pd.DataFrame: Combined and sorted quotes DataFrame containing columns:
             - oid: Object identifier
@@ -160,8 +183,17 @@ def get_quotes(
         xtb_instrument_id = get_xtb_instrument_id(br_symbol=br_symbol)
     oid = get_oid_by_symbol(xtb_instrument_id=xtb_instrument_id)
     engine = get_db_engine()
-    
-    sql_hist = """
+
+    if columns:
+        unknown = set(columns) - set(_QUOTE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown quote columns requested: {sorted(unknown)}")
+        col_list = ", ".join(f'"{c}"' for c in columns)
+    else:
+        col_list = "*"
+
+    sql_hist = f"""
+        select {col_list} from (
         select q.oid
             , m.xtb_instrument_id instrument_id
             , q.raw_ts
@@ -181,6 +213,7 @@ def get_quotes(
         and day_nbr < to_char(current_timestamp, 'YYYYMMDD')::int
         AND q.ts_dt > current_timestamp - (:days_back || ' days')::INTERVAL
         and q.oid = :oid
+        ) sub
         """
     db_quotes_hist_df = pd.read_sql(
         text(sql_hist),
@@ -193,7 +226,8 @@ def get_quotes(
     )
     db_quotes_hist_df = db_quotes_hist_df.convert_dtypes()
 
-    sql_today = """
+    sql_today = f"""
+       select {col_list} from (
        select m.oid
             , q.instrument_id
             , q.raw_ts 
@@ -211,6 +245,7 @@ def get_quotes(
             on q.instrument_id = m.xtb_instrument_id 
         where day_nbr = to_char(current_timestamp, 'YYYYMMDD')::int
         and q.instrument_id = :xtb_instrument_id
+        ) sub
     """
     print(
         f"Fetching quotes for XTB Instrument ID: {xtb_instrument_id}, Days Back: {days_back}"
@@ -228,7 +263,9 @@ def get_quotes(
     db_quotes_today_df = db_quotes_today_df.convert_dtypes()
 
     db_quotes_df = pd.concat([db_quotes_hist_df, db_quotes_today_df], ignore_index=True)
-    db_quotes_df = db_quotes_df.sort_values(by=["ts_dt"]).reset_index(drop=True)
+    # A columns subset may omit ts_dt; only chronological results can be sorted
+    if "ts_dt" in db_quotes_df.columns:
+        db_quotes_df = db_quotes_df.sort_values(by=["ts_dt"]).reset_index(drop=True)
 
     
     return db_quotes_df
@@ -1,5 +1,5 @@
 import os
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from database import SessionM
 from sqlalchemy import text
@@ -19,7 +19,7 @@ class AuthenticationError(Exception):
 
 
 def validate_user_credentials(
-    username: str, password: str
+    username: str, password: str, session=None
 ) -> Tuple[bool, Optional[dict]]:
     """
     Validate user credentials against database
@@ -27,11 +27,15 @@ def validate_user_credentials(
     Args:
         username: Username to validate
         password: Plain text password
+        session: Optional existing session to reuse; a new one is opened
+            (and closed) when omitted
 
     Returns:
         Tuple of (is_valid, user_data) where user_data contains user info if valid
     """
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         # Get the encrypted password from database
@@ -50,24 +54,28 @@ def validate_user_credentials(
                 stored_password = decrypt_password(result.password_hash)
 
                 if stored_password == password:
+                    # Update last login time; RETURNING hands back the fresh
+                    # timestamp so callers need no follow-up SELECT
+                    update_sql = f"""
+                        UPDATE {USERS_TABLE}
+                        SET last_login = CURRENT_TIMESTAMP
+                        WHERE user_id = :user_id
+                        RETURNING last_login
+                    """
+                    updated = session.execute(
+                        text(update_sql), {"user_id": result.user_id}
+                    ).first()
+                    session.commit()
+
                     user_data = {
                         "user_id": result.user_id,
                         "username": result.username,
                         "email": result.email,
                         "is_active": result.is_active,
                         "created_at": result.created_at,
-                        "last_login": result.last_login,
+                        "last_login": updated.last_login,
                     }
 
-                    # Update last login time
-                    update_sql = f"""
-                        UPDATE {USERS_TABLE} 
-                        SET last_login = CURRENT_TIMESTAMP 
-                        WHERE user_id = :user_id
-                    """
-                    session.execute(text(update_sql), {"user_id": result.user_id})
-                    session.commit()
-
                     logger.info(f"User {username} successfully authenticated")
                     return True, user_data
                 else:
@@ -91,12 +99,22 @@ def validate_user_credentials(
         session.rollback()
         return False, None
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
-def create_user(username: str, email: str, password: str) -> bool:
-    """Create a new user"""
-    session = SessionM()
+def create_user(
+    username: str, email: str, password: str, session=None
+) -> Union[dict, bool]:
+    """Create a new user.
+
+    Returns the inserted row (user_id, username, email, is_active) as a
+    dict on success, or False on failure, so callers get the new user_id
+    without a follow-up SELECT.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         encrypted_password = encrypt_password(password)
@@ -104,28 +122,37 @@ def create_user(username: str, email: str, password: str) -> bool:
         sql = f"""
         INSERT INTO {USERS_TABLE} (username, email, password_hash)
         VALUES (:username, :email, :password_hash)
+        RETURNING user_id, username, email, is_active
         """
 
-        session.execute(
+        row = session.execute(
             text(sql),
             {"username": username, "email": email, "password_hash": encrypted_password},
-        )
+        ).first()
         session.commit()
 
         logger.info(f"User {username} created successfully")
-        return True
+        return {
+            "user_id": row.user_id,
+            "username": row.username,
+            "email": row.email,
+            "is_active": row.is_active,
+        }
 
     except Exception as e:
         logger.error(f"Error creating user: {e}")
         session.rollback()
         return False
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
-def change_password(username: str, new_password: str) -> bool:
+def change_password(username: str, new_password: str, session=None) -> bool:
     """Change user password"""
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         encrypted_password = encrypt_password(new_password)
@@ -153,15 +180,18 @@ def change_password(username: str, new_password: str) -> bool:
         session.rollback()
         return False
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
 # Add these functions to your existing users.py file
 
 
-def get_all_users() -> list:
+def get_all_users(session=None) -> list:
     """Get all users from database"""
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         sql = f"""
@@ -193,12 +223,15 @@ def get_all_users() -> list:
         logger.error(f"Error getting all users: {e}")
         return []
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
-def deactivate_user(user_id: int) -> bool:
+def deactivate_user(user_id: int, session=None) -> bool:
     """Deactivate a user"""
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         sql = f"""
@@ -222,12 +255,15 @@ def deactivate_user(user_id: int) -> bool:
         session.rollback()
         return False
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
-def activate_user(user_id: int) -> bool:
+def activate_user(user_id: int, session=None) -> bool:
     """Activate a user"""
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         sql = f"""
@@ -251,12 +287,15 @@ def activate_user(user_id: int) -> bool:
         session.rollback()
         return False
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
-def delete_user(user_id: int) -> bool:
+def delete_user(user_id: int, session=None) -> bool:
     """Delete a user (use with caution)"""
-    session = SessionM()
+    owns_session = session is None
+    if owns_session:
+        session = SessionM()
 
     try:
         sql = f"""
@@ -279,7 +318,8 @@ def delete_user(user_id: int) -> bool:
         session.rollback()
         return False
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,26 @@
 import os
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
 
 
+@lru_cache(maxsize=4)
+def _get_cipher(key: str) -> Fernet:
+    """Build the Fernet cipher once per key; construction decodes and
+    validates the key on every call otherwise."""
+    return Fernet(key)
+
+
 def encrypt_password(password: str) -> str:
     """Encrypt the password using Fernet"""
-    cipher_suite = Fernet(os.getenv("ENCRYPTING_KEY"))
+    cipher_suite = _get_cipher(os.getenv("ENCRYPTING_KEY"))
     encrypted_password = cipher_suite.encrypt(password.encode()).decode("utf-8")
     return encrypted_password
 
 
 def decrypt_password(encrypted_password: str) -> str:
     """Decrypt the encrypted password using Fernet"""
-    cipher_suite = Fernet(os.getenv("ENCRYPTING_KEY"))
+    cipher_suite = _get_cipher(os.getenv("ENCRYPTING_KEY"))
     decrypted_password = cipher_suite.decrypt(encrypted_password.encode()).decode(
         "utf-8"
     )
@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 def format_currency_human_readable(amount, currency: str = "PLN"):
     """
     Format a potentially large number as a human-readable currency value.
@@ -80,6 +84,48 @@ def format_currency_human_readable(amount, currency: str = "PLN"):
         return f"{formatted_str} {currency}"
 
 
+def format_currency_human_readable_series(amounts: pd.Series, currency: str = "PLN"):
+    """
+    Vectorized counterpart of format_currency_human_readable for a Series.
+
+    Magnitude binning (tys./mln/mld) and scaling run as NumPy kernels over
+    the whole column; only the final locale-style string assembly happens
+    per element. Non-numeric or NaN inputs are passed through unchanged,
+    matching the scalar helper.
+
+    Args:
+        amounts: Series of numeric amounts (or string representations)
+        currency: Currency symbol/code (default: "PLN")
+
+    Returns:
+        Series of formatted strings, original values where not numeric
+
+    Examples:
+        >>> format_currency_human_readable_series(pd.Series([1230000, 500000])).tolist()
+        ['1,23 mln PLN', '500,00 tys. PLN']
+    """
+    numeric = pd.to_numeric(amounts, errors="coerce")
+    values = numeric.to_numpy(dtype=float, na_value=float("nan"))
+    abs_values = np.abs(values)
+    big = [abs_values >= 1_000_000_000, abs_values >= 1_000_000, abs_values >= 1_000]
+    scale = np.select(big, [1_000_000_000.0, 1_000_000.0, 1_000.0], default=1.0)
+    suffixes = np.select(big, ["mld", "mln", "tys."], default="")
+    scaled = values / scale
+
+    out = []
+    for original, value, suffix, is_number in zip(
+        amounts, scaled, suffixes, np.isfinite(values)
+    ):
+        if not is_number:
+            out.append(original)
+        elif suffix:
+            out.append(f"{value:.2f}".replace(".", ",") + f" {suffix} {currency}")
+        else:
+            formatted = f"{value:,.2f}".replace(",", " ").replace(".", ",")
+            out.append(f"{formatted} {currency}")
+    return pd.Series(out, index=amounts.index, dtype=object)
+
+
 def format_currency_compact(amount, currency: str = "PLN"):
     """
     Format a number as a more compact currency value (shorter suffixes).
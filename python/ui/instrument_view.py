@@ -1,61 +1,217 @@
 # instrument_view.py
+import logging
+import threading
+from functools import lru_cache
+
 from tools.logger import get_logger
 from typing import List, Tuple, Optional
 
 import markdown
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 import streamlit as st
 from database import reporting
 from tools.utils import format_currency_human_readable
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import AgGrid, DataReturnMode, GridOptionsBuilder, GridUpdateMode
 
 # Set up logging
 logger = get_logger(__name__)
 
+try:
+    # numba is optional; when absent the helper below runs as plain Python
+    from numba import njit
+except ImportError:
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+
+        return wrap
+
+
+# Reusable converter: building the extension pipeline is the expensive part
+# of markdown.markdown, so construct it once per thread and reset state per
+# conversion. Markdown instances are stateful and Streamlit serves each
+# session on its own thread, so a single shared instance is not safe when
+# concurrent cache misses convert at the same time.
+_MD_LOCAL = threading.local()
+
+
+def _get_md() -> markdown.Markdown:
+    md = getattr(_MD_LOCAL, "converter", None)
+    if md is None:
+        md = markdown.Markdown(extensions=["nl2br", "tables", "fenced_code"])
+        _MD_LOCAL.converter = md
+    return md
+
+# Upper bound on candles handed to the browser; beyond this the chart is
+# resampled to coarser OHLC bars before rendering
+_MAX_CANDLES = 2000
+
+# X-axis range breaks are identical for every chart; build the dicts once
+_RANGEBREAKS = [
+    dict(bounds=["sat", "mon"]),  # Hide weekends
+    dict(bounds=[17, 9], pattern="hour"),  # Hide after hours
+]
+
+# Marker styling per decision type; constant, so built once at import.
+# With batched traces each dict is consulted once per type, not per row
+_DECISION_COLORS = {
+    "BUY": "#1f77b4",
+    "SELL": "#d62728",
+    "SL": "#ff7f0e",
+    "TP": "#2ca02c",
+}
+_DECISION_SYMBOLS = {
+    "BUY": "triangle-up",
+    "SELL": "triangle-down",
+    "SL": "x",
+    "TP": "circle",
+}
+
+# Instrument summary header; parsed once, filled per render via format_map
+_PROFILE_HEADER_TMPL = """
+        <div style="
+            background: linear-gradient(90deg, #f0f2f6, #ffffff);
+            padding: 20px;
+            border-radius: 10px;
+            border-left: 5px solid #1f77b4;
+            margin-bottom: 20px;
+        ">
+            <h2 style="margin: 0; color: #1f77b4;">
+                📊 {xtb_long_name}
+            </h2>
+            <p style="margin: 5px 0; color: #666; font-size: 14px;">
+                <strong>Symbol:</strong> {br_code} |
+                <strong>Branża:</strong> {branch} |
+                <strong>OID:</strong> {oid}
+                <a href="{url}" target="_blank" style="text-decoration: none; margin-left: 10px;">
+                    <span style="font-size: 20px; color: #1f77b4;">🔗</span>
+                </a>
+            </p>
+            <p style="margin: 10px 0 5px 0; color: #444; font-size: 13px;">
+                <strong>💰 Kapitalizacja:</strong> {capitalization_formatted} |
+                <strong>🏢 Wartość przedsiębiorstwa:</strong> {enterprise_value_formatted}
+            </p>
+            <p style="margin: 10px 0 5px 0; color: #444; font-size: 13px;">
+                <strong>📅 Data debiutu:</strong> {intro_date} |
+                <strong>⏰ Ostatni setup:</strong> {last_ts}
+            </p>
+            <p style="margin: 14px 0 5px 0; color: #444; font-size: 13px;">
+                {descript}
+            </p>
+        </div>
+        """
+
+# Static candlestick layout, validated once at import; per-figure calls only
+# merge the dynamic Y-axis range on top
+_CHART_TEMPLATE = go.layout.Template(
+    layout=dict(
+        height=600,
+        xaxis=dict(
+            title="Czas",
+            gridcolor="lightgray",
+            showgrid=True,
+            zeroline=False,
+        ),
+        yaxis=dict(
+            title="Cena",
+            gridcolor="lightgray",
+            showgrid=True,
+            zeroline=False,
+        ),
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=50, r=50, t=60, b=50),
+        hovermode="closest",
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+    )
+)
+
+
+
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast default-width numeric columns to the smallest fitting dtype.
+
+    Ids, volumes and prices rarely need 64 bits; narrowing them roughly
+    halves frame memory and speeds later comparisons and sorts. Nullable
+    integer columns containing NA are left untouched.
+
+    Args:
+        df: DataFrame to downcast in place
+
+    Returns:
+        The same DataFrame with narrowed numeric columns
+    """
+    for c in df.select_dtypes(include=["int64", "Int64"]).columns:
+        if not df[c].isna().any():
+            df[c] = pd.to_numeric(df[c].astype("int64"), downcast="integer")
+    for c in df.select_dtypes(include=["float64", "Float64"]).columns:
+        df[c] = pd.to_numeric(df[c].astype("float64"), downcast="float")
+    return df
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_hidden_acum_df() -> pd.DataFrame:
     """
     Load hidden accumulation data from the database.
 
+    Cached for 5 minutes so Streamlit reruns reuse the frame instead of
+    re-querying the database on every widget interaction.
+
     Returns:
         DataFrame containing hidden accumulation data or empty DataFrame if none found
     """
     try:
         hidden_acum_df = reporting.get_accum_score_points()
-        return hidden_acum_df
+        return _downcast_numeric(hidden_acum_df)
     except Exception as e:
         logger.error(f"Error loading hidden accumulation data: {e}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_profile_data() -> pd.DataFrame:
     """
     Load profile data for instruments with active accumulation setup.
-    
+
+    Cached for 5 minutes; reruns get the memoized frame instead of a SQL
+    round trip.
+
     Returns:
         DataFrame with columns: oid, last_ts, xtb_long_name, br_code, branch, 
         descript, intro_date, volume, capitalization, enterprive_value
     """
     try:
         profile_df = reporting.get_accum_profile_data()
+        if not profile_df.empty:
+            profile_df = _downcast_numeric(profile_df)
+            # Index by oid (kept as a column too) so per-instrument lookups
+            # are O(1) .loc hits instead of boolean-mask scans
+            profile_df = profile_df.set_index("oid", drop=False)
         return profile_df
     except Exception as e:
         logger.error(f"Error loading profile data: {e}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_portfolio_data() -> pd.DataFrame:
     """
     Load open positions data from the database.
 
+    Cached for 5 minutes; reruns get the memoized frame instead of a SQL
+    round trip.
+
     Returns:
         DataFrame containing open positions or empty DataFrame if none found
     """
     try:
         positions_df = reporting.get_reporting_positions()
-        return positions_df
+        return _downcast_numeric(positions_df)
     except Exception as e:
         logger.error(f"Error loading portfolio data: {e}")
         return pd.DataFrame()
@@ -80,18 +236,31 @@ def select_position(
         - symbol: Instrument symbol
         - recommendation_id: Associated recommendation ID
     """
-    print("show_df")
-    print(show_df.head().to_markdown())  # Debugging output
+    # Render the positions via AgGrid with client-side virtualization: sorts
+    # and filters stay in the browser, and the stable key lets the component
+    # reuse its client-side state across Streamlit reruns
+    gob = GridOptionsBuilder.from_dataframe(show_df)
+    gob.configure_default_column(filterable=True, sortable=True, resizable=True)
+    gob.configure_grid_options(rowBuffer=20, cacheBlockSize=100, maxBlocksInCache=10)
+    AgGrid(
+        show_df,
+        gridOptions=gob.build(),
+        update_mode=GridUpdateMode.NO_UPDATE,
+        fit_columns_on_grid_load=True,
+        key="positions-grid",
+        theme="streamlit",
+    )
 
-    print("positions_df")
-    print(positions_df.head().to_markdown())  # Debugging output
+    display_options = show_df["display"].tolist()
+    # O(1) hash lookup instead of a boolean-mask scan over the display column
+    display_to_idx = dict(zip(display_options, show_df.index))
 
     selected_display = st.selectbox(
         "Wybierz pozycję do podglądu szczegółów:",
-        show_df["display"].tolist(),
+        display_options,
     )
 
-    selected_index = show_df[show_df["display"] == selected_display].index[0]
+    selected_index = display_to_idx[selected_display]
     selected_row = positions_df.iloc[selected_index]
 
     xtb_instrument_id = int(selected_row["xtb_instrument_id"])
@@ -105,6 +274,39 @@ def select_position(
 
 
 
+def _format_ts_minute(s: pd.Series) -> pd.Series:
+    """
+    Format a datetime Series as 'YYYY-MM-DD HH:MM' without per-row strftime.
+
+    Composes the string from vectorized year/month/day/hour/minute component
+    extraction, which runs as a handful of NumPy kernels instead of one
+    CPython strftime call per element. NaT becomes an empty string.
+
+    Args:
+        s: Series of datetimes (or parseable values)
+
+    Returns:
+        Series of formatted strings
+    """
+    dt = pd.to_datetime(s, errors="coerce")
+    out = pd.Series("", index=s.index, dtype=object)
+    mask = dt.notna()
+    if mask.any():
+        d = dt[mask]
+        out[mask] = (
+            d.dt.year.astype(str).str.zfill(4)
+            + "-"
+            + d.dt.month.astype(str).str.zfill(2)
+            + "-"
+            + d.dt.day.astype(str).str.zfill(2)
+            + " "
+            + d.dt.hour.astype(str).str.zfill(2)
+            + ":"
+            + d.dt.minute.astype(str).str.zfill(2)
+        )
+    return out
+
+
 def prepare_timestamp_data(df: pd.DataFrame, timestamp_cols: List[str]) -> pd.DataFrame:
     """
     Convert string timestamp columns to datetime objects.
@@ -135,21 +337,25 @@ def markdown_to_html(text: str) -> str:
     """
     if not text or pd.isna(text):
         return "Brak uzasadnienia"
+    return _md_to_html_cached(text)
+
 
+@lru_cache(maxsize=2048)
+def _md_to_html_cached(text: str) -> str:
+    """
+    Cached markdown→HTML conversion for recurring rationales.
+
+    Many markers on one chart repeat the same explanation text, so the
+    markdown parser's regex passes only run once per unique string. The
+    None/NaN guard lives in markdown_to_html since lru_cache needs
+    hashable arguments.
+    """
     # Clean up special characters first
     cleaned_text = text.replace("¶", "\n\n").replace("|", "\n- ")
 
     try:
-        # Convert markdown to HTML with basic extensions
-        html = markdown.markdown(
-            cleaned_text,
-            extensions=["nl2br", "tables", "fenced_code"],
-            extension_configs={
-                "nl2br": {},  # Empty config for nl2br
-                "tables": {},
-                "fenced_code": {},
-            },
-        )
+        # Convert markdown to HTML with this thread's pre-built converter
+        html = _get_md().reset().convert(cleaned_text)
 
         # Clean up paragraph tags for better hover display
         html = html.replace("<p>", "").replace("</p>", "<br>")
@@ -165,6 +371,48 @@ def markdown_to_html(text: str) -> str:
     return html
 
 
+@njit(cache=True)
+def _sl_tp_value_bounds(
+    new_sl: np.ndarray,
+    actual_sl: np.ndarray,
+    new_tp: np.ndarray,
+    actual_tp: np.ndarray,
+    min_realistic: float,
+) -> Tuple[float, float]:
+    """
+    Compute the min/max of realistic SL/TP levels across all decisions.
+
+    Values that are NaN, zero or below min_realistic are ignored. Returns
+    (inf, -inf) when no realistic level exists. JIT-compiled when numba is
+    installed, so large decision histories scan at native speed.
+    """
+    lo = np.inf
+    hi = -np.inf
+    for i in range(new_sl.shape[0]):
+        sl = new_sl[i]
+        if np.isnan(sl) or sl == 0.0:
+            sl = actual_sl[i]
+        if not np.isnan(sl) and sl != 0.0 and sl > min_realistic:
+            lo = min(lo, sl)
+            hi = max(hi, sl)
+        tp = new_tp[i]
+        if np.isnan(tp) or tp == 0.0:
+            tp = actual_tp[i]
+        if not np.isnan(tp) and tp != 0.0 and tp > min_realistic:
+            lo = min(lo, tp)
+            hi = max(hi, tp)
+    return lo, hi
+
+
+def _decision_level_column(decisions_df: pd.DataFrame, column: str) -> np.ndarray:
+    """Extract an SL/TP level column as float64, NaN-filling missing columns."""
+    if column in decisions_df.columns:
+        return pd.to_numeric(decisions_df[column], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+    return np.full(len(decisions_df), np.nan)
+
+
 def create_candlestick_chart(
     reco: dict,
     quotes_df: pd.DataFrame,
@@ -190,54 +438,75 @@ def create_candlestick_chart(
     if quotes_df.empty:
         raise ValueError("Cannot create chart: quotes_df is empty")
 
-    # Make a copy to avoid modifying the original dataframes
-    quotes_df = quotes_df.copy()
-    decisions_df = decisions_df.copy() if not decisions_df.empty else pd.DataFrame()
-    orders_df = orders_df.copy() if not orders_df.empty else pd.DataFrame()
+    # Shallow copies are enough to protect the callers' frames: every
+    # mutation below is a whole-column assignment, which rebinds the column
+    # on the copy instead of writing into the shared arrays. Avoids
+    # memcpying every column of potentially large intraday frames.
+    quotes_df = quotes_df.copy(deep=False)
+    decisions_df = (
+        decisions_df.copy(deep=False) if not decisions_df.empty else pd.DataFrame()
+    )
+    orders_df = orders_df.copy(deep=False) if not orders_df.empty else pd.DataFrame()
 
-    # Convert timestamp columns to datetime objects if needed
+    # Convert timestamp columns to datetime only when the source layer has
+    # not already done so; skips a full O(rows) parse on the common path
     timestamp_cols = ["ts_dt", "ts_dt_local"]
     for col in timestamp_cols:
-        if col in quotes_df.columns:
-            # Force conversion even for object dtype columns
-            try:
-                quotes_df[col] = pd.to_datetime(quotes_df[col], errors="coerce")
-                logger.info(
-                    f"Converted {col} to datetime, dtype: {quotes_df[col].dtype}"
-                )
-            except Exception as e:
-                logger.warning(f"Error converting {col} to datetime: {e}")
-
-    if not decisions_df.empty and "ins_ts" in decisions_df.columns:
-        try:
-            decisions_df["ins_ts"] = pd.to_datetime(
-                decisions_df["ins_ts"], errors="coerce"
-            )
-        except Exception as e:
-            logger.warning(f"Error converting ins_ts to datetime: {e}")
-
-    if not orders_df.empty and "ins_ts" in orders_df.columns:
-        try:
-            orders_df["ins_ts"] = pd.to_datetime(orders_df["ins_ts"], errors="coerce")
-        except Exception as e:
-            logger.warning(f"Error converting ins_ts to datetime: {e}")
+        if col in quotes_df.columns and not pd.api.types.is_datetime64_any_dtype(
+            quotes_df[col]
+        ):
+            quotes_df[col] = pd.to_datetime(quotes_df[col], errors="coerce")
+            logger.info(f"Converted {col} to datetime, dtype: {quotes_df[col].dtype}")
+
+    for history_df in (decisions_df, orders_df):
+        if (
+            not history_df.empty
+            and "ins_ts" in history_df.columns
+            and not pd.api.types.is_datetime64_any_dtype(history_df["ins_ts"])
+        ):
+            history_df["ins_ts"] = pd.to_datetime(history_df["ins_ts"], errors="coerce")
 
     # Get the timestamp column to use - prefer ts_dt_local if available
     timestamp_col = "ts_dt_local" if "ts_dt_local" in quotes_df.columns else "ts_dt"
 
-    # Verify the timestamp column is properly converted
+    # The gated conversion above is authoritative; if the column still isn't
+    # datetime the source data is broken and re-parsing won't fix it
     if not pd.api.types.is_datetime64_any_dtype(quotes_df[timestamp_col]):
-        logger.warning(
-            f"Timestamp column {timestamp_col} is not datetime type: {quotes_df[timestamp_col].dtype}"
+        raise ValueError(
+            f"Timestamp column {timestamp_col} could not be parsed as datetime "
+            f"(dtype: {quotes_df[timestamp_col].dtype})"
         )
-        # Force conversion one more time
-        quotes_df[timestamp_col] = pd.to_datetime(
-            quotes_df[timestamp_col], errors="coerce"
+
+    # Downsample long series before building SVG candles: browser DOM cost
+    # scales with candle count and minute-level detail is invisible at year
+    # scale anyway
+    n_quotes = len(quotes_df)
+    if n_quotes > _MAX_CANDLES:
+        rule = f"{max(1, n_quotes // _MAX_CANDLES)}min"
+        quotes_df = (
+            quotes_df.set_index(timestamp_col)
+            .resample(rule)
+            .agg({"open": "first", "max": "max", "min": "min", "close": "last"})
+            .dropna()
+            .reset_index()
+        )
+        logger.info(
+            f"Downsampled quotes from {n_quotes} to {len(quotes_df)} candles ({rule})"
         )
 
     # Create figure
     fig = go.Figure()
 
+    # Price extrema feed both the recommendation line and the Y-axis range;
+    # reduce the raw ndarrays once instead of going through pandas' boxed,
+    # NaN-checking min/max several times on large intraday frames
+    price_low = float(
+        np.nanmin(quotes_df["min"].to_numpy(dtype=float, na_value=np.nan))
+    )
+    price_high = float(
+        np.nanmax(quotes_df["max"].to_numpy(dtype=float, na_value=np.nan))
+    )
+
     # Add candlestick trace
     fig.add_trace(
         go.Candlestick(
@@ -264,8 +533,8 @@ def create_candlestick_chart(
                 reco_ts_dt = reco_ts
 
             # Get min and max price values for the vertical line height
-            y_min = quotes_df["min"].min() * 0.995  # Slightly below min
-            y_max = quotes_df["max"].max() * 1.005  # Slightly above max
+            y_min = price_low * 0.995  # Slightly below min
+            y_max = price_high * 1.005  # Slightly above max
 
             # Add the vertical line
             fig.add_trace(
@@ -339,228 +608,276 @@ def create_candlestick_chart(
             logger.warning(f"Error getting timestamp: {e}")
             chart_end_time = pd.Timestamp.now()
 
-        for idx, row in decisions_sorted.iterrows():
+        # Each decision's segment ends where the next one starts; the last
+        # (and any NaT) extends to the chart end. Computed once vectorially
+        # instead of an iloc/Series build per iteration.
+        end_times = decisions_sorted["ins_ts"].shift(-1)
+        end_times = end_times.where(end_times.notna(), chart_end_time)
+
+        # Collect SL/TP segments and add them as at most four traces (active
+        # and historical, per line type) instead of two traces per decision;
+        # None entries separate the segments within one trace
+        hist_sl_x, hist_sl_y = [], []
+        hist_tp_x, hist_tp_y = [], []
+        active_sl = None
+        active_tp = None
+
+        # itertuples avoids constructing a Series per row (unlike iterrows)
+        for idx, row in enumerate(decisions_sorted.itertuples(index=False)):
             try:
-                start_time = row["ins_ts"]
+                start_time = row.ins_ts
                 if pd.isna(start_time):
                     continue
 
                 is_last_decision = idx == len(decisions_sorted) - 1
-
-                # Determine end time based on whether this is the last decision
-                if is_last_decision:
-                    # Last decision: extend to the end of the chart
-                    end_time = chart_end_time
-                else:
-                    # Historical decisions: end at the next decision time
-                    end_time = decisions_sorted.iloc[idx + 1]["ins_ts"]
-                    if pd.isna(end_time):
-                        end_time = chart_end_time
-
-                # Add stop loss line
-                sl_value = row.get("new_sl") or row.get("actual_sl")
-                # logger.info(
-                #     f"Processing decision row {idx}: SL={sl_value}, TP={row.get('new_tp') or row.get('actual_tp')}"
-                # )
+                end_time = end_times.iat[idx]
+
+                # NaN or zero means "not set": fall back to the actual level,
+                # matching the policy used by _sl_tp_value_bounds so every
+                # level inside the Y-axis range also gets its line drawn
+                sl_value = getattr(row, "new_sl", None)
+                if pd.isna(sl_value) or sl_value == 0:
+                    sl_value = getattr(row, "actual_sl", None)
                 if pd.notnull(sl_value) and sl_value != 0:
-                    # logger.info(
-                    #     f"Adding Stop Loss line for decision {idx}: SL={sl_value}, Start={start_time}, End={end_time}"
-                    # )
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[start_time, end_time],
-                            y=[sl_value, sl_value],
-                            mode="lines",
-                            line=dict(
-                                color="red",
-                                dash="dot",
-                                width=(
-                                    active_width
-                                    if is_last_decision
-                                    else historical_width
-                                ),
-                            ),
-                            opacity=(
-                                active_opacity
-                                if is_last_decision
-                                else historical_opacity
-                            ),
-                            name="Stop Loss (aktywny)" if is_last_decision else None,
-                            hovertemplate="<b>Stop Loss</b><br>"
-                            + f"Wartość: {sl_value:.4f}<br>"
-                            + f"Status: {'🟢 Aktywny' if is_last_decision else '🔘 Historyczny'}<br>"
-                            + f"Okres: {start_time} - {end_time}<extra></extra>",
-                            showlegend=is_last_decision,
-                        )
-                    )
+                    if is_last_decision:
+                        active_sl = (start_time, end_time, sl_value)
+                    else:
+                        hist_sl_x.extend([start_time, end_time, None])
+                        hist_sl_y.extend([sl_value, sl_value, None])
 
-                # Add take profit line
-                tp_value = row.get("new_tp") or row.get("actual_tp")
-                # logger.info(
-                #     f"Processing decision row {idx}: TP={tp_value}, SL={sl_value}"
-                # )
+                tp_value = getattr(row, "new_tp", None)
+                if pd.isna(tp_value) or tp_value == 0:
+                    tp_value = getattr(row, "actual_tp", None)
                 if pd.notnull(tp_value) and tp_value != 0:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[start_time, end_time],
-                            y=[tp_value, tp_value],
-                            mode="lines",
-                            line=dict(
-                                color="green",
-                                dash="dot",
-                                width=(
-                                    active_width
-                                    if is_last_decision
-                                    else historical_width
-                                ),
-                            ),
-                            opacity=(
-                                active_opacity
-                                if is_last_decision
-                                else historical_opacity
-                            ),
-                            name="Take Profit (aktywny)" if is_last_decision else None,
-                            hovertemplate="<b>Take Profit</b><br>"
-                            + f"Wartość: {tp_value:.4f}<br>"
-                            + f"Status: {'🟢 Aktywny' if is_last_decision else '🔘 Historyczny'}<br>"
-                            + f"Okres: {start_time} - {end_time}<extra></extra>",
-                            showlegend=is_last_decision,
-                        )
-                    )
+                    if is_last_decision:
+                        active_tp = (start_time, end_time, tp_value)
+                    else:
+                        hist_tp_x.extend([start_time, end_time, None])
+                        hist_tp_y.extend([tp_value, tp_value, None])
             except Exception as e:
                 logger.warning(f"Error processing decision row {idx}: {e}")
                 continue
 
-    # Add decision markers
-    decision_colors = {
-        "BUY": "#1f77b4",
-        "SELL": "#d62728",
-        "SL": "#ff7f0e",
-        "TP": "#2ca02c",
-    }
-    decision_symbols = {
-        "BUY": "triangle-up",
-        "SELL": "triangle-down",
-        "SL": "x",
-        "TP": "circle",
-    }
+        if hist_sl_x:
+            fig.add_trace(
+                go.Scattergl(
+                    x=hist_sl_x,
+                    y=hist_sl_y,
+                    mode="lines",
+                    line=dict(color="red", dash="dot", width=historical_width),
+                    opacity=historical_opacity,
+                    name="Stop Loss (historyczny)",
+                    hovertemplate="<b>Stop Loss</b><br>"
+                    + "Wartość: %{y:.4f}<br>"
+                    + "Status: 🔘 Historyczny<extra></extra>",
+                    showlegend=False,
+                )
+            )
 
-    if not decisions_df.empty:
-        for _, row in decisions_df.iterrows():
-            try:
-                decision_type = row.get("decision", "UNKNOWN")
-                color = decision_colors.get(decision_type, "#7f7f7f")
-                symbol = decision_symbols.get(decision_type, "circle")
+        if hist_tp_x:
+            fig.add_trace(
+                go.Scattergl(
+                    x=hist_tp_x,
+                    y=hist_tp_y,
+                    mode="lines",
+                    line=dict(color="green", dash="dot", width=historical_width),
+                    opacity=historical_opacity,
+                    name="Take Profit (historyczny)",
+                    hovertemplate="<b>Take Profit</b><br>"
+                    + "Wartość: %{y:.4f}<br>"
+                    + "Status: 🔘 Historyczny<extra></extra>",
+                    showlegend=False,
+                )
+            )
 
-                # Calculate y-value safely
-                if pd.notnull(row.get("actual_price")):
-                    y_val = float(row["actual_price"])
-                else:
-                    # Safely get max close price as fallback
-                    try:
-                        y_val = float(quotes_df["close"].max())
-                    except:
-                        y_val = 0.0  # Fallback value
-
-                # Get and format explanation
-                explanation = row.get("short_explanation", "")
-                explanation_html = markdown_to_html(explanation)
-
-                # Format timestamp for display
-                timestamp_str = str(row["ins_ts"])
-                change_volume = (
-                    str(row["change_volume"]) if "change_volume" in row else "0"
+        if active_sl:
+            start_time, end_time, sl_value = active_sl
+            fig.add_trace(
+                go.Scattergl(
+                    x=[start_time, end_time],
+                    y=[sl_value, sl_value],
+                    mode="lines",
+                    line=dict(color="red", dash="dot", width=active_width),
+                    opacity=active_opacity,
+                    name="Stop Loss (aktywny)",
+                    hovertemplate="<b>Stop Loss</b><br>"
+                    + f"Wartość: {sl_value:.4f}<br>"
+                    + "Status: 🟢 Aktywny<br>"
+                    + f"Okres: {start_time} - {end_time}<extra></extra>",
+                    showlegend=True,
                 )
-                if pd.notnull(row["ins_ts"]):
-                    try:
-                        timestamp_obj = pd.to_datetime(row["ins_ts"])
-                        timestamp_str = timestamp_obj.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        pass
-
-                # Create custom hover template with formatted HTML
-                hover_template = (
-                    "<b>🎯 Decyzja: %{customdata[0]}</b><br>"
-                    + "<b>📅 Czas:</b> %{customdata[1]}<br>"
-                    + "<b>💰 Cena:</b> %{y:.4f}<br>"
-                    + "<b>💰 Zmiana wolumenu:</b> %{customdata[3]}<br>"
-                    + "<b>📝 Uzasadnienie:</b><br>%{customdata[2]}"
-                    + "<extra></extra>"
+            )
+
+        if active_tp:
+            start_time, end_time, tp_value = active_tp
+            fig.add_trace(
+                go.Scattergl(
+                    x=[start_time, end_time],
+                    y=[tp_value, tp_value],
+                    mode="lines",
+                    line=dict(color="green", dash="dot", width=active_width),
+                    opacity=active_opacity,
+                    name="Take Profit (aktywny)",
+                    hovertemplate="<b>Take Profit</b><br>"
+                    + f"Wartość: {tp_value:.4f}<br>"
+                    + "Status: 🟢 Aktywny<br>"
+                    + f"Okres: {start_time} - {end_time}<extra></extra>",
+                    showlegend=True,
                 )
+            )
 
-                fig.add_trace(
-                    go.Scatter(
-                        x=[row["ins_ts"]],
-                        y=[y_val],
-                        mode="markers+text",
-                        marker=dict(
-                            size=12,
-                            color=color,
-                            symbol=symbol,
-                            line=dict(width=2, color="white"),
-                        ),
-                        text=[decision_type],
-                        textposition="top center",
-                        textfont=dict(size=10, color="white"),
-                        name=f"Decyzja: {decision_type}",
-                        customdata=[
-                            [
-                                decision_type,
-                                timestamp_str,
-                                explanation_html,
-                                change_volume,
-                            ]
-                        ],
-                        hovertemplate=hover_template,
-                        showlegend=True,
-                    )
+    # Add decision markers. Rows are validated up front (a marker needs a
+    # timestamp) so the trace-building code below is a straight-line path
+    # instead of a broad per-row try/except that hides data issues
+    valid_decisions = (
+        decisions_df[decisions_df["ins_ts"].notna()]
+        if not decisions_df.empty and "ins_ts" in decisions_df.columns
+        else pd.DataFrame()
+    )
+    if not decisions_df.empty and len(valid_decisions) < len(decisions_df):
+        logger.warning(
+            f"Dropped {len(decisions_df) - len(valid_decisions)} decision rows "
+            "without a valid ins_ts"
+        )
+
+    if not valid_decisions.empty:
+        # Column presence is per-frame, not per-row; resolve it once
+        has_actual_price = "actual_price" in valid_decisions.columns
+        has_explanation = "short_explanation" in valid_decisions.columns
+        has_change_volume = "change_volume" in valid_decisions.columns
+
+        # Fallback marker height is the same for every decision; one ndarray
+        # reduction up front (quotes_df is guaranteed non-empty here)
+        fallback_y = float(
+            np.nanmax(quotes_df["close"].to_numpy(dtype=float, na_value=np.nan))
+        )
+
+        # Custom hover template with formatted HTML (shared by all types)
+        hover_template = (
+            "<b>🎯 Decyzja: %{customdata[0]}</b><br>"
+            + "<b>📅 Czas:</b> %{customdata[1]}<br>"
+            + "<b>💰 Cena:</b> %{y:.4f}<br>"
+            + "<b>💰 Zmiana wolumenu:</b> %{customdata[3]}<br>"
+            + "<b>📝 Uzasadnienie:</b><br>%{customdata[2]}"
+            + "<extra></extra>"
+        )
+
+        # Precompute hover fields column-wise: one vectorized strftime pass
+        # and one map through the cached markdown converter instead of a
+        # scalar parse/format/convert per marker
+        ts_fmt = pd.to_datetime(
+            valid_decisions["ins_ts"], errors="coerce"
+        ).dt.strftime("%Y-%m-%d %H:%M:%S")
+        ts_fmt = ts_fmt.where(ts_fmt.notna(), valid_decisions["ins_ts"].astype(str))
+        if has_explanation:
+            explanation_html = valid_decisions["short_explanation"].map(
+                markdown_to_html
+            )
+        else:
+            explanation_html = pd.Series(
+                markdown_to_html(""), index=valid_decisions.index
+            )
+        if has_change_volume:
+            volume_str = valid_decisions["change_volume"].astype(str)
+        else:
+            volume_str = pd.Series("0", index=valid_decisions.index)
+
+        # One trace per decision type instead of one per decision: figure
+        # JSON size and browser render cost stay O(types) regardless of how
+        # long the decision history grows
+        decision_col = (
+            valid_decisions["decision"]
+            if "decision" in valid_decisions.columns
+            else pd.Series("UNKNOWN", index=valid_decisions.index)
+        )
+        for decision_type, group in valid_decisions.groupby(decision_col, sort=False):
+            color = _DECISION_COLORS.get(decision_type, "#7f7f7f")
+            symbol = _DECISION_SYMBOLS.get(decision_type, "circle")
+
+            # Marker heights for the whole group at once
+            if has_actual_price:
+                y_vals = (
+                    pd.to_numeric(group["actual_price"], errors="coerce")
+                    .fillna(fallback_y)
+                    .astype(float)
                 )
-            except Exception as e:
-                logger.warning(f"Error processing decision marker: {e}")
-                continue
+            else:
+                y_vals = pd.Series(fallback_y, index=group.index)
+
+            customdata = [
+                [decision_type, ts, expl, vol]
+                for ts, expl, vol in zip(
+                    ts_fmt[group.index],
+                    explanation_html[group.index],
+                    volume_str[group.index],
+                )
+            ]
+
+            fig.add_trace(
+                go.Scattergl(
+                    x=group["ins_ts"],
+                    y=y_vals,
+                    mode="markers+text",
+                    marker=dict(
+                        size=12,
+                        color=color,
+                        symbol=symbol,
+                        line=dict(width=2, color="white"),
+                    ),
+                    text=[decision_type] * len(group),
+                    textposition="top center",
+                    textfont=dict(size=10, color="white"),
+                    name=f"Decyzja: {decision_type}",
+                    customdata=customdata,
+                    hovertemplate=hover_template,
+                    showlegend=True,
+                )
+            )
 
     # Add order markers
-    if not orders_df.empty:
-        for _, row in orders_df.iterrows():
-            try:
-                if pd.notnull(row.get("order_buy_price")):
-                    order_price = float(row["order_buy_price"])
-
-                    # Format order timestamp
-                    order_timestamp_str = str(row.get("ins_ts", ""))
-                    if pd.notnull(row.get("ins_ts")):
-                        try:
-                            order_timestamp_obj = pd.to_datetime(row["ins_ts"])
-                            order_timestamp_str = order_timestamp_obj.strftime(
-                                "%Y-%m-%d %H:%M:%S"
-                            )
-                        except:
-                            pass
+    # Same upfront validation for order markers: a marker needs both a buy
+    # price and a timestamp, so filter once and drop the per-row try/except
+    valid_orders = (
+        orders_df[orders_df["order_buy_price"].notna() & orders_df["ins_ts"].notna()]
+        if not orders_df.empty
+        and {"order_buy_price", "ins_ts"}.issubset(orders_df.columns)
+        else pd.DataFrame()
+    )
+    if not valid_orders.empty:
+        # Format all order timestamps in one column-wise pass instead of a
+        # scalar pd.to_datetime + strftime per marker; unparseable values
+        # fall back to their string form like before
+        order_ts_fmt = pd.to_datetime(
+            valid_orders["ins_ts"], errors="coerce"
+        ).dt.strftime("%Y-%m-%d %H:%M:%S")
+        order_ts_fmt = order_ts_fmt.where(
+            order_ts_fmt.notna(), valid_orders["ins_ts"].astype(str)
+        )
+        for row in valid_orders.itertuples():
+            order_price = float(row.order_buy_price)
+            order_timestamp_str = order_ts_fmt.at[row.Index]
 
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[row["ins_ts"]],
-                            y=[order_price],
-                            mode="markers",
-                            marker=dict(
-                                size=14,
-                                color="#ff7f0e",
-                                symbol="diamond",
-                                line=dict(width=2, color="white"),
-                            ),
-                            name="Operacja",
-                            hovertemplate="<b>📊 Operacja zakupu</b><br>"
-                            + "<b>📅 Czas:</b> "
-                            + order_timestamp_str
-                            + "<br>"
-                            + "<b>💰 Cena:</b> %{y:.4f}<br>"
-                            + "<extra></extra>",
-                            showlegend=True,
-                        )
-                    )
-            except Exception as e:
-                logger.warning(f"Error processing order marker: {e}")
-                continue
+            fig.add_trace(
+                go.Scattergl(
+                    x=[row.ins_ts],
+                    y=[order_price],
+                    mode="markers",
+                    marker=dict(
+                        size=14,
+                        color="#ff7f0e",
+                        symbol="diamond",
+                        line=dict(width=2, color="white"),
+                    ),
+                    name="Operacja",
+                    hovertemplate="<b>📊 Operacja zakupu</b><br>"
+                    + "<b>📅 Czas:</b> "
+                    + order_timestamp_str
+                    + "<br>"
+                    + "<b>💰 Cena:</b> %{y:.4f}<br>"
+                    + "<extra></extra>",
+                    showlegend=True,
+                )
+            )
 
     # Add accumulation score points if available
     logger.info(f"Processing accumulation points. accum_df is None: {accum_df is None}")
@@ -572,8 +889,9 @@ def create_candlestick_chart(
     if accum_df is not None and not accum_df.empty:
         logger.info(f"Starting to add {len(accum_df)} accumulation points to chart")
         try:
-            # Convert timestamp column to datetime if needed
-            accum_df_copy = accum_df.copy()
+            # Convert timestamp column to datetime if needed (shallow copy:
+            # the ts conversion below rebinds the column, never writes in place)
+            accum_df_copy = accum_df.copy(deep=False)
             if "ts" in accum_df_copy.columns:
                 logger.info("Converting ts column to datetime")
                 accum_df_copy["ts"] = pd.to_datetime(accum_df_copy["ts"], errors="coerce")
@@ -630,8 +948,10 @@ def create_candlestick_chart(
                             logger.info(f"Point {idx}: ts={ts}, matched price={close_price:.4f}")
                     
                     logger.info(f"Adding trace with {len(y_values)} accumulation points")
+                    # Scattergl renders markers via WebGL, which stays smooth
+                    # even with tens of thousands of accumulation points
                     fig.add_trace(
-                        go.Scatter(
+                        go.Scattergl(
                             x=accum_df_copy["ts"],
                             y=y_values,
                             mode="markers",
@@ -663,63 +983,48 @@ def create_candlestick_chart(
 
     # Calculate appropriate Y-axis range based on price data and SL/TP levels
     try:
-        # Start with price data
-        min_price = quotes_df["min"].min()
-        max_price = quotes_df["max"].max()
+        # Start with price data (extrema were reduced once above)
+        min_price = price_low
+        max_price = price_high
 
         # Collect all relevant values for Y-axis range calculation
         all_y_values = [min_price, max_price]
 
         # Add SL and TP values from decisions_df if available
         if not decisions_df.empty:
-            # Get all SL values (both new_sl and actual_sl)
-            sl_values = []
-            tp_values = []
-
-            for idx, row in decisions_df.iterrows():
-                sl_value = row.get("new_sl") or row.get("actual_sl")
-                tp_value = row.get("new_tp") or row.get("actual_tp")
-
-                # Only include realistic, non-zero, non-null values
-                # Filter out values that are too close to zero (likely erroneous)
-                min_realistic_value = (
-                    min_price * 0.1
-                )  # Must be at least 10% of minimum price
-
-                if (
-                    pd.notnull(sl_value)
-                    and sl_value != 0
-                    and sl_value > min_realistic_value
-                ):
-                    sl_values.append(sl_value)
-
-                if (
-                    pd.notnull(tp_value)
-                    and tp_value != 0
-                    and tp_value > min_realistic_value
-                ):
-                    tp_values.append(tp_value)
-
-            # Add SL/TP values to the range calculation
-            all_y_values.extend(sl_values)
-            all_y_values.extend(tp_values)
+            # Only include realistic, non-zero, non-null values
+            # Filter out values that are too close to zero (likely erroneous)
+            min_realistic_value = (
+                min_price * 0.1
+            )  # Must be at least 10% of minimum price
+
+            sl_tp_lo, sl_tp_hi = _sl_tp_value_bounds(
+                _decision_level_column(decisions_df, "new_sl"),
+                _decision_level_column(decisions_df, "actual_sl"),
+                _decision_level_column(decisions_df, "new_tp"),
+                _decision_level_column(decisions_df, "actual_tp"),
+                float(min_realistic_value),
+            )
+
+            # Add SL/TP bounds to the range calculation
+            if np.isfinite(sl_tp_lo):
+                all_y_values.append(sl_tp_lo)
+            if np.isfinite(sl_tp_hi):
+                all_y_values.append(sl_tp_hi)
 
         # Calculate range based on all values
         if all_y_values:
-            min_value = min(all_y_values)
-            max_value = max(all_y_values)
+            # Single C-level pass instead of Python-level min()/max() walks
+            y_arr = np.fromiter(all_y_values, dtype=np.float64, count=len(all_y_values))
+            min_value = y_arr.min()
+            max_value = y_arr.max()
 
-            # Add some padding (5% on each side)
+            # Padding: 5% of the value range, with the range floored at 2% of
+            # the max value so near-flat series still get visible headroom
             value_range = max_value - min_value
-            padding = value_range * 0.05
+            padding = max(value_range, max_value * 0.02) * 0.05
             y_min = min_value - padding
             y_max = max_value + padding
-
-            # If range is very small, add minimum padding
-            if value_range < max_value * 0.02:  # Less than 2% range
-                padding = max_value * 0.02
-                y_min = min_value - padding
-                y_max = max_value + padding
         else:
             # Fallback to price data only
             price_range = max_price - min_price
@@ -733,44 +1038,82 @@ def create_candlestick_chart(
         y_min = None
         y_max = None
 
-    # Update layout with enhanced styling
+    # Apply the frozen layout template; only the Y-axis range is per-figure
     fig.update_layout(
-        height=600,
-        # title=dict(
-        #     text="Wykres świecowy z decyzjami i operacjami", x=0.5, font=dict(size=16)
-        # ),
-        xaxis=dict(
-            title="Czas",
-            gridcolor="lightgray",
-            showgrid=True,
-            zeroline=False,
-        ),
-        yaxis=dict(
-            title="Cena",
-            gridcolor="lightgray",
-            showgrid=True,
-            zeroline=False,
-            range=[y_min, y_max] if y_min is not None and y_max is not None else None,
+        template=_CHART_TEMPLATE,
+        yaxis_range=(
+            [y_min, y_max] if y_min is not None and y_max is not None else None
         ),
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        margin=dict(l=50, r=50, t=60, b=50),
-        hovermode="closest",
-        plot_bgcolor="white",
-        paper_bgcolor="white",
     )
 
-    # Add range breaks for weekends and after hours
-    fig.update_xaxes(
-        rangebreaks=[
-            dict(bounds=["sat", "mon"]),  # Hide weekends
-            dict(bounds=[17, 9], pattern="hour"),  # Hide after hours
-        ]
-    )
+    # Add range breaks only where the data actually has gaps: a break that
+    # overlaps real quotes would hide candles, and every active break costs
+    # plotly.js extra axis work on each render
+    ts = quotes_df[timestamp_col]
+    active_breaks = []
+    if not ts.dt.dayofweek.isin((5, 6)).any():
+        active_breaks.append(_RANGEBREAKS[0])  # Hide weekends
+    hours = ts.dt.hour
+    if not ((hours >= 17) | (hours < 9)).any():
+        active_breaks.append(_RANGEBREAKS[1])  # Hide after hours
+    if active_breaks:
+        fig.update_xaxes(rangebreaks=active_breaks)
 
     return fig
 
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_instrument_figure(
+    oid: int, br_code: str, days_back: int
+) -> Optional[go.Figure]:
+    """
+    Load quotes and accumulation points for an instrument and build its chart.
+
+    Cached per (oid, br_code, days_back) so reruns that merely reselect the
+    same instrument skip both the DB queries and the Plotly trace assembly.
+
+    Args:
+        oid: Object ID of the instrument
+        br_code: Biznes Radar symbol used to fetch quotes
+        days_back: Lookback window for quotes
+
+    Returns:
+        Plotly figure, or None when no quotes are available
+    """
+    logger.info(
+        f"Building figure for instrument: {br_code}, oid: {oid}, days_back: {days_back}"
+    )
+    quotes_df = reporting.get_quotes(
+        br_symbol=br_code,
+        days_back=days_back,
+        columns=("ts_dt", "min", "max", "open", "close"),
+    )
+    logger.info(f"Loaded {len(quotes_df)} quote records")
+    if quotes_df.empty:
+        return None
+
+    # Downcast OHLC to float32: halves the payload Plotly serializes for the
+    # browser with no visible precision loss at display scale
+    ohlc_cols = ["min", "max", "open", "close"]
+    quotes_df[ohlc_cols] = quotes_df[ohlc_cols].astype(np.float32)
+
+    # Filter accumulation points for this instrument
+    accum_df = load_hidden_acum_df()
+    instrument_accum_df = (
+        accum_df[accum_df["oid"] == oid] if not accum_df.empty else pd.DataFrame()
+    )
+    logger.info(f"Filtered to {len(instrument_accum_df)} accumulation points for oid {oid}")
+
+    return create_candlestick_chart(
+        reco={},  # No recommendation data needed
+        quotes_df=quotes_df,
+        decisions_df=pd.DataFrame(),  # No decisions
+        orders_df=pd.DataFrame(),  # No orders
+        close_time_dt=None,
+        accum_df=instrument_accum_df,  # Pass accumulation points
+    )
+
+
 def show_instrument_selector() -> Optional[int]:
     """
     Display instrument selector based on profile data and return selected oid.
@@ -793,14 +1136,13 @@ def show_instrument_selector() -> Optional[int]:
         st.session_state.selected_instrument_index = 0
 
     with st.expander("📊 Wybór instrumentu", expanded=True):
-        # Prepare display dataframe
-        display_df = profile_df.copy()
-        display_df["display_index"] = display_df.index
-        
-        # Select columns for display
+        # Project only the display columns and tag each row with its position;
+        # avoids copying the full profile frame twice on every rerun
         display_columns = ["oid", "xtb_long_name", "br_code", "branch", "last_ts"]
-        grid_df = display_df[display_columns + ["display_index"]].copy()
-        
+        grid_df = profile_df[display_columns].assign(
+            display_index=np.arange(len(profile_df))
+        )
+
         # Rename columns for better display
         grid_df = grid_df.rename(columns={
             "oid": "🆔 OID",
@@ -810,10 +1152,19 @@ def show_instrument_selector() -> Optional[int]:
             "last_ts": "⏰ Ostatni setup"
         })
 
-        # Convert any problematic columns to string for display
-        for col in grid_df.columns:
-            if col != "display_index" and grid_df[col].dtype == "object":
-                grid_df[col] = grid_df[col].astype(str)
+        # Pre-format datetime columns column-wise; otherwise AgGrid stringifies
+        # them cell by cell while serializing the frame to JSON
+        for c in grid_df.select_dtypes(include=["datetime64[ns]", "datetimetz"]).columns:
+            grid_df[c] = _format_ts_minute(grid_df[c])
+
+        # Convert any problematic columns to string for display in one pass;
+        # Arrow-backed strings avoid per-element Python object allocation
+        object_cols = [
+            c for c in grid_df.columns
+            if c != "display_index" and grid_df[c].dtype == object
+        ]
+        if object_cols:
+            grid_df = grid_df.astype({c: "string[pyarrow]" for c in object_cols})
 
         # Configure AgGrid with pre-selection
         gb = GridOptionsBuilder.from_dataframe(grid_df)
@@ -824,15 +1175,29 @@ def show_instrument_selector() -> Optional[int]:
         )
         gb.configure_grid_options(domLayout="normal")
         gb.configure_grid_options(rowStyle={"cursor": "pointer"})
+        # Virtualize rendering for large portfolios: paginate in fixed blocks and
+        # keep only a small row buffer mounted in the DOM. AG Grid's "infinite"
+        # row model needs a server-side datasource, which streamlit-aggrid's
+        # request/response cycle cannot provide, so block pagination + row
+        # virtualization is the closest equivalent here.
+        gb.configure_grid_options(
+            pagination=True,
+            paginationPageSize=100,
+            rowBuffer=20,
+            maxBlocksInCache=4,
+            maxConcurrentDatasourceRequests=1,
+        )
         gb.configure_default_column(min_column_width=100)
         gb.configure_column("display_index", hide=True)
         grid_options = gb.build()
 
-        # Use AgGrid with customized options
+        # Use AgGrid with customized options; only react to selection changes
+        # and return selection-only data instead of round-tripping all rows
         grid_response = AgGrid(
             grid_df,
             gridOptions=grid_options,
-            update_mode="SELECTION_CHANGED",
+            update_mode=GridUpdateMode.SELECTION_CHANGED,
+            data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
             fit_columns_on_grid_load=True,
             height=300,
             allow_unsafe_jscode=True,
@@ -896,32 +1261,38 @@ def show_instrument_view(oid: int):
         st.warning("Brak instrumentów z aktywnym setupem akumulacji.")
         return
 
-    # Filter to get the specific instrument
-    filtered_profile = profile_df[profile_df["oid"] == oid]
-
-    if filtered_profile.empty:
+    # Get the instrument profile via the oid index (hash lookup, no scan)
+    try:
+        instrument_profile = profile_df.loc[oid]
+    except KeyError:
         st.error(f"Nie znaleziono instrumentu dla OID: {oid}")
         return
 
-    # Get the instrument profile
-    instrument_profile = filtered_profile.iloc[0]
+    if isinstance(instrument_profile, pd.DataFrame):
+        instrument_profile = instrument_profile.iloc[0]
+
+    # Convert once; the field reads below become plain dict lookups instead
+    # of pandas indexer calls
+    profile = instrument_profile.to_dict()
 
     # Show info about the instrument being displayed
-    st.info(f"📌 Wyświetlanie szczegółów dla instrumentu: **{instrument_profile['xtb_long_name']}** (OID: {oid})")
+    st.info(f"📌 Wyświetlanie szczegółów dla instrumentu: **{profile['xtb_long_name']}** (OID: {oid})")
 
     # Extract instrument details
-    br_code = instrument_profile.get("br_code", "N/A")
-    xtb_long_name = instrument_profile.get("xtb_long_name", "N/A")
-    branch = instrument_profile.get("branch", "N/A")
-    descript = instrument_profile.get("descript", "N/A")
-    intro_date = instrument_profile.get("intro_date", "N/A")
-    volume = instrument_profile.get("volume", 0)
-    capitalization = instrument_profile.get("capitalization", 0)
-    enterprise_value = instrument_profile.get("enterprive_value", 0)
-    last_ts = instrument_profile.get("last_ts", "N/A")
-    
-    print(instrument_profile)
-    
+    br_code = profile.get("br_code", "N/A")
+    xtb_long_name = profile.get("xtb_long_name", "N/A")
+    branch = profile.get("branch", "N/A")
+    descript = profile.get("descript", "N/A")
+    intro_date = profile.get("intro_date", "N/A")
+    volume = profile.get("volume", 0)
+    capitalization = profile.get("capitalization", 0)
+    enterprise_value = profile.get("enterprive_value", 0)
+    last_ts = profile.get("last_ts", "N/A")
+
+    # Gated so the dict is not repr-formatted on every rerun at INFO level
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Instrument profile: %s", profile)
+
     # Format currency values
     volume_formatted = format_currency_human_readable(volume)
     capitalization_formatted = format_currency_human_readable(capitalization)
@@ -929,40 +1300,23 @@ def show_instrument_view(oid: int):
     # Create external link to biznesradar
     url = f"https://www.biznesradar.pl/notowania/{br_code}"
     
-    # Display instrument summary with formatted HTML
+    # Display instrument summary with formatted HTML (template is hoisted to
+    # module scope; only the per-instrument values are substituted here)
     st.markdown(
-        f"""
-        <div style="
-            background: linear-gradient(90deg, #f0f2f6, #ffffff);
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid #1f77b4;
-            margin-bottom: 20px;
-        ">
-            <h2 style="margin: 0; color: #1f77b4;">
-                📊 {xtb_long_name}
-            </h2>
-            <p style="margin: 5px 0; color: #666; font-size: 14px;">
-                <strong>Symbol:</strong> {br_code} | 
-                <strong>Branża:</strong> {branch} | 
-                <strong>OID:</strong> {oid}
-                <a href="{url}" target="_blank" style="text-decoration: none; margin-left: 10px;">
-                    <span style="font-size: 20px; color: #1f77b4;">🔗</span>
-                </a>
-            </p>
-            <p style="margin: 10px 0 5px 0; color: #444; font-size: 13px;">
-                <strong>💰 Kapitalizacja:</strong> {capitalization_formatted} | 
-                <strong>🏢 Wartość przedsiębiorstwa:</strong> {enterprise_value_formatted}
-            </p>
-            <p style="margin: 10px 0 5px 0; color: #444; font-size: 13px;">
-                <strong>📅 Data debiutu:</strong> {intro_date} | 
-                <strong>⏰ Ostatni setup:</strong> {last_ts}
-            </p>
-            <p style="margin: 14px 0 5px 0; color: #444; font-size: 13px;">
-                {descript} 
-            </p>
-        </div>
-        """,
+        _PROFILE_HEADER_TMPL.format_map(
+            dict(
+                xtb_long_name=xtb_long_name,
+                br_code=br_code,
+                branch=branch,
+                oid=oid,
+                url=url,
+                capitalization_formatted=capitalization_formatted,
+                enterprise_value_formatted=enterprise_value_formatted,
+                intro_date=intro_date,
+                last_ts=last_ts,
+                descript=descript,
+            )
+        ),
         unsafe_allow_html=True,
     )
 
@@ -971,41 +1325,17 @@ def show_instrument_view(oid: int):
 
     # Load data for charts - use a reasonable lookback period
     days_back = 365  # Default to 30 days for accumulation analysis
-    
-    logger.info(f"Loading quotes for instrument: {br_code}, oid: {oid}, days_back: {days_back}")
-    # Need to get xtb_instrument_id from oid
-    # For now, we'll use br_symbol to get quotes
-    quotes_df = reporting.get_quotes(br_symbol=br_code, days_back=days_back)
-    logger.info(f"Loaded {len(quotes_df)} quote records")
-    
-    # Load accumulation points
-    logger.info("Loading all accumulation data")
-    accum_df = load_hidden_acum_df()
-    logger.info(f"Loaded {len(accum_df)} total accumulation records")
-    
-    # Filter accumulation points for this instrument
-    instrument_accum_df = accum_df[accum_df["oid"] == oid] if not accum_df.empty else pd.DataFrame()
-    logger.info(f"Filtered to {len(instrument_accum_df)} accumulation points for oid {oid}")
-    if not instrument_accum_df.empty:
-        logger.info(f"Sample accumulation data:\n{instrument_accum_df.head()}")
 
-    if quotes_df.empty:
-        st.warning("Brak notowań instrumentu.")
-    else:
-        # Create and display chart
-        try:
-            fig = create_candlestick_chart(
-                reco={},  # No recommendation data needed
-                quotes_df=quotes_df,
-                decisions_df=pd.DataFrame(),  # No decisions
-                orders_df=pd.DataFrame(),  # No orders
-                close_time_dt=None,
-                accum_df=instrument_accum_df  # Pass accumulation points
-            )
+    # Create and display chart (cached across reruns per oid/days_back)
+    try:
+        fig = _build_instrument_figure(oid, br_code, days_back)
+        if fig is None:
+            st.warning("Brak notowań instrumentu.")
+        else:
             st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"Error creating chart: {e}")
-            logger.exception("Error creating candlestick chart")
+    except Exception as e:
+        st.error(f"Error creating chart: {e}")
+        logger.exception("Error creating candlestick chart")
 
 
 def show_instrument_management_view():
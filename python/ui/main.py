@@ -24,164 +24,176 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Initialize session state
-if "authenticated" not in st.session_state:
-    st.session_state.authenticated = False
-if "user_data" not in st.session_state:
-    st.session_state.user_data = None
+# Navigation button CSS; identical for every page, so built once at import
+# and injected once per rerun instead of rebuilt inside the page loop
+_NAV_BUTTON_CSS = """
+    <style>
+    .nav-button {
+        width: 100%;
+        padding: 12px 16px;
+        margin: 8px 0;
+        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
+        border: none;
+        border-radius: 8px;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        display: flex;
+        align-items: center;
+        text-decoration: none;
+        color: #333;
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+    }
+    .nav-button:hover {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        transform: translateY(-2px);
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
+    }
+    .nav-button.active {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
+    }
+    .nav-icon {
+        margin-right: 10px;
+        font-size: 18px;
+    }
+    .nav-text {
+        flex-grow: 1;
+        font-weight: 500;
+    }
+    .nav-desc {
+        font-size: 11px;
+        opacity: 0.8;
+        margin-top: 2px;
+    }
+    </style>
+"""
+
+# Static sidebar fragments; constant across reruns, so built once at import.
+# They stay as separate emits where widgets (user info, nav buttons) must
+# render between them, but each block is a single markdown call
+_SIDEBAR_HEADER_HTML = """
+<div style="
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    padding: 20px;
+    border-radius: 12px;
+    margin-bottom: 20px;
+    text-align: center;
+    color: white;
+    box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
+">
+    <h2 style="margin: 0; font-size: 24px;">📈 AIVestor (10xDev)</h2>
+    <p style="margin: 5px 0 0 0; opacity: 0.9; font-size: 14px;">Autonomous Trading System</p>
+</div>
+"""
+
+_SIDEBAR_NAV_HEADER_HTML = """
+<div style="
+    background: rgba(255, 255, 255, 0.05);
+    padding: 15px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+">
+    <h3 style="
+        margin: 0 0 15px 0;
+        color: #333;
+        font-size: 18px;
+        display: flex;
+        align-items: center;
+    ">
+        🧭 Nawigacja
+    </h3>
+</div>
+"""
+
+# Divider plus quick stats merged into one markdown emit
+_SIDEBAR_STATS_HTML = """
+---
+<div style="
+    background: rgba(255, 255, 255, 0.05);
+    padding: 15px;
+    border-radius: 10px;
+    margin-top: 20px;
+">
+    <h4 style="margin: 0 0 10px 0; color: #333;">📈 Quick Stats</h4>
+    <div style="display: flex; justify-content: space-between; font-size: 12px; color: #666;">
+        <span>Version: 2.0</span>
+        <span>Status: ✅ Online</span>
+    </div>
+</div>
+"""
+
+# Page registry at module scope: built once per worker instead of on every
+# rerun inside the authenticated branch
+PAGES = {
+    "📊 Przegląd instrumentów": {
+        "function": show_instrument_management_view,
+        "description": "Zarządzaj portfelem instrumentów",
+        "icon": "📊",
+    },
+    "👥 Użytkownicy": {
+        "function": show_user_management_view,
+        "description": "Zarządzanie użytkownikami",
+        "icon": "👥",
+    },
+}
+_PAGE_NAMES = tuple(PAGES)
+_FIRST_PAGE = _PAGE_NAMES[0]
+
+# Initialize session state defaults in one pass
+_SESSION_DEFAULTS = {
+    "authenticated": False,
+    "user_data": None,
+    "current_page": _FIRST_PAGE,
+}
+for _key, _value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, _value)
 
 # Check authentication
 if not check_authentication():
     show_login_page()
 else:
     # User is authenticated, show main app
-    PAGES = {
-        "📊 Przegląd instrumentów": {
-            "function": show_instrument_management_view,
-            "description": "Zarządzaj portfelem instrumentów",
-            "icon": "📊",
-        },
-        "👥 Użytkownicy": {
-            "function": show_user_management_view,
-            "description": "Zarządzanie użytkownikami",
-            "icon": "👥",
-        },
-    }
-
     # Sidebar with modern design
     with st.sidebar:
         # Modern header with branding
-        st.markdown(
-            """
-        <div style="
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            border-radius: 12px;
-            margin-bottom: 20px;
-            text-align: center;
-            color: white;
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-        ">
-            <h2 style="margin: 0; font-size: 24px;">📈 AIVestor (10xDev)</h2>
-            <p style="margin: 5px 0 0 0; opacity: 0.9; font-size: 14px;">Autonomous Trading System</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
 
         # Show user information with modern styling
         show_user_info()
 
         # Modern navigation menu
-        st.markdown(
-            """
-        <div style="
-            background: rgba(255, 255, 255, 0.05);
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        ">
-            <h3 style="
-                margin: 0 0 15px 0;
-                color: #333;
-                font-size: 18px;
-                display: flex;
-                align-items: center;
-            ">
-                🧭 Nawigacja
-            </h3>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_SIDEBAR_NAV_HEADER_HTML, unsafe_allow_html=True)
 
         # Create modern menu buttons
+        st.markdown(_NAV_BUTTON_CSS, unsafe_allow_html=True)
         selected_page = None
 
-        for page_name, page_info in PAGES.items():
-            # Create custom styled button
-            button_style = f"""
-                <style>
-                .nav-button {{
-                    width: 100%;
-                    padding: 12px 16px;
-                    margin: 8px 0;
-                    background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-                    border: none;
-                    border-radius: 8px;
-                    cursor: pointer;
-                    transition: all 0.3s ease;
-                    display: flex;
-                    align-items: center;
-                    text-decoration: none;
-                    color: #333;
-                    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-                }}
-                .nav-button:hover {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-                }}
-                .nav-button.active {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-                }}
-                .nav-icon {{
-                    margin-right: 10px;
-                    font-size: 18px;
-                }}
-                .nav-text {{
-                    flex-grow: 1;
-                    font-weight: 500;
-                }}
-                .nav-desc {{
-                    font-size: 11px;
-                    opacity: 0.8;
-                    margin-top: 2px;
-                }}
-                </style>
-            """
-
-            # Use button with callback
-            if st.button(
-                f"{page_info['icon']} {page_name.split(' ', 1)[1]}",
-                key=f"nav_{page_name}",
-                help=page_info["description"],
-                use_container_width=True,
-            ):
-                selected_page = page_name
-                st.session_state.current_page = page_name
-
-        # Remember last selected page
-        if "current_page" not in st.session_state:
-            st.session_state.current_page = "📊 Przegląd instrumentów"
+        if len(PAGES) > 1:
+            for page_name, page_info in PAGES.items():
+                # Use button with callback
+                if st.button(
+                    f"{page_info['icon']} {page_name.split(' ', 1)[1]}",
+                    key=f"nav_{page_name}",
+                    help=page_info["description"],
+                    use_container_width=True,
+                ):
+                    selected_page = page_name
+                    st.session_state.current_page = page_name
+        else:
+            # Single page: skip rendering a nav button nobody can use
+            selected_page = _FIRST_PAGE
+            st.session_state.current_page = selected_page
 
+        # Remember last selected page (default seeded in _SESSION_DEFAULTS)
         if selected_page is None:
             selected_page = st.session_state.current_page
         else:
             st.session_state.current_page = selected_page
 
-        # Quick stats section
-        st.markdown("---")
-        st.markdown(
-            """
-        <div style="
-            background: rgba(255, 255, 255, 0.05);
-            padding: 15px;
-            border-radius: 10px;
-            margin-top: 20px;
-        ">
-            <h4 style="margin: 0 0 10px 0; color: #333;">📈 Quick Stats</h4>
-            <div style="display: flex; justify-content: space-between; font-size: 12px; color: #666;">
-                <span>Version: 2.0</span>
-                <span>Status: ✅ Online</span>
-            </div>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        # Quick stats section (divider and stats in one emit)
+        st.markdown(_SIDEBAR_STATS_HTML, unsafe_allow_html=True)
 
         # Optional: Show current user ID for debugging (smaller and less prominent)
         user_data = get_current_user()
@@ -236,5 +248,5 @@ else:
                 st.rerun()
         with col2:
             if st.button("🏠 Powrót do instrumentów"):
-                st.session_state.current_page = list(PAGES.keys())[0]
+                st.session_state.current_page = _FIRST_PAGE
                 st.rerun()
@@ -1,22 +1,56 @@
+from __future__ import annotations
+
+import re
+
 import streamlit as st
-import pandas as pd
-from typing import Optional
-from database.users import (
-    create_user,
-    change_password,
-    validate_user_credentials,
-    get_all_users,
-    deactivate_user,
-    activate_user,
-    delete_user,
-    AuthenticationError,
-)
+from typing import TYPE_CHECKING, Optional
 from ui.auth import get_current_user
 from tools.logger import get_logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Basic email shape check, compiled once at import
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# pandas and database.users are imported lazily inside the functions that
+# need them: this module is imported by main.py on every worker start, but
+# its views only render when the admin page is opened
+
 logger = get_logger(__name__)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_get_all_users() -> list:
+    """
+    Cached wrapper around get_all_users.
+
+    Reruns triggered by widget interactions reuse the memoized list instead
+    of hitting the database; the short TTL bounds staleness and every
+    mutating action clears the cache explicitly.
+    """
+    from database.users import get_all_users
+
+    return get_all_users()
+
+
+@st.cache_data(show_spinner=False)
+def _build_user_options(users_tuple: tuple) -> dict:
+    """
+    Build the admin selectbox option lists from a hashable users snapshot.
+
+    Cached so reruns with an unchanged user set reuse the three lists; the
+    tuple itself is the cache key, so any change in the underlying data
+    produces fresh options.
+    """
+    active, inactive, all_users = [], [], []
+    for user_id, username, email, is_active in users_tuple:
+        option = (user_id, f"{username} ({email})")
+        all_users.append(option)
+        (active if is_active else inactive).append(option)
+    return {"active": active, "inactive": inactive, "all": all_users}
+
+
 def show_user_management_view():
     """Display the user management page"""
     current_user = get_current_user()
@@ -54,10 +88,12 @@ def show_user_management_view():
 
 def show_users_list():
     """Display list of all users"""
+    import pandas as pd
+
     st.subheader("📋 Lista Użytkowników")
 
     try:
-        users_data = get_all_users()
+        users_data = _cached_get_all_users()
 
         if not users_data:
             st.info("📭 Brak użytkowników w systemie")
@@ -66,20 +102,26 @@ def show_users_list():
         # Convert to DataFrame for better display
         df = pd.DataFrame(users_data)
 
-        # Format the data for display
-        display_df = df.copy()
-        display_df["created_at"] = pd.to_datetime(display_df["created_at"]).dt.strftime(
-            "%Y-%m-%d %H:%M"
-        )
-        display_df["last_login"] = pd.to_datetime(display_df["last_login"]).dt.strftime(
-            "%Y-%m-%d %H:%M"
-        )
-        display_df["is_active"] = display_df["is_active"].map(
-            {True: "✅ Aktywny", False: "❌ Nieaktywny"}
+        # Parse and format both timestamp columns in a single pass: stacking
+        # them lets one to_datetime/strftime call cover both, and unstack
+        # restores the column layout (reindex guards all-null columns)
+        ts_fmt = (
+            pd.to_datetime(df[["created_at", "last_login"]].stack(), errors="coerce")
+            .dt.strftime("%Y-%m-%d %H:%M")
+            .unstack()
+            .reindex(columns=["created_at", "last_login"])
         )
 
-        # Rename columns for Polish display
-        display_df = display_df.rename(
+        # Format for display without duplicating the whole frame: assign
+        # produces a new frame with just the formatted columns rebound, and
+        # the projection keeps only what the table shows
+        display_df = df.assign(
+            created_at=ts_fmt["created_at"],
+            last_login=ts_fmt["last_login"],
+            is_active=df["is_active"].map({True: "✅ Aktywny", False: "❌ Nieaktywny"}),
+        )[
+            ["user_id", "username", "email", "is_active", "created_at", "last_login"]
+        ].rename(
             columns={
                 "user_id": "ID",
                 "username": "Nazwa użytkownika",
@@ -91,81 +133,95 @@ def show_users_list():
         )
 
         # Display the table
-        st.dataframe(
-            display_df[
-                [
-                    "ID",
-                    "Nazwa użytkownika",
-                    "Email",
-                    "Status",
-                    "Data utworzenia",
-                    "Ostatnie logowanie",
-                ]
-            ],
-            use_container_width=True,
-            hide_index=True,
-        )
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
 
-        # User management actions
-        st.markdown("### ⚙️ Akcje na użytkownikach")
+        # User management actions (fragment-scoped, see below); resolve the
+        # current user once per rerun and pass it down
+        _user_actions_fragment(df, get_current_user())
 
-        col1, col2, col3 = st.columns(3)
+    except Exception as e:
+        st.error(f"❌ Błąd podczas pobierania listy użytkowników: {e}")
+        logger.error(f"Error getting users list: {e}")
 
-        with col1:
-            st.markdown("**🔒 Dezaktywuj użytkownika**")
+
+@st.fragment
+def _user_actions_fragment(df: pd.DataFrame, current_user: dict):
+    """
+    Admin actions on users, scoped as a fragment.
+
+    Changing one of the selectboxes below reruns only this block instead of
+    the whole script (sidebar, auth checks and the active page included).
+    Successful mutations still trigger a full rerun so the users table
+    above refreshes.
+    """
+    from database.users import activate_user, deactivate_user, delete_user
+
+    st.markdown("### ⚙️ Akcje na użytkownikach")
+
+    # Snapshot the relevant columns as a hashable tuple and let the cached
+    # helper build (user_id, "name (email)") options; unchanged user sets
+    # skip the rebuild entirely across reruns
+    users_tuple = tuple(
+        zip(df["user_id"], df["username"], df["email"], df["is_active"].astype(bool))
+    )
+    opts = _build_user_options(users_tuple)
+
+    col1, col2, col3 = st.columns(3)
+
+    # Each action lives in its own st.form: changing the dropdown no longer
+    # triggers a rerun, only the explicit submit does
+    with col1:
+        st.markdown("**🔒 Dezaktywuj użytkownika**")
+        with st.form("deactivate_user_form"):
             user_to_deactivate = st.selectbox(
                 "Wybierz użytkownika do dezaktywacji:",
-                options=[
-                    (row["user_id"], f"{row['username']} ({row['email']})")
-                    for _, row in df[df["is_active"] == True].iterrows()
-                ],
+                options=opts["active"],
                 format_func=lambda x: x[1] if x else "Brak aktywnych użytkowników",
                 key="deactivate_user",
             )
 
-            if st.button("🔒 Dezaktywuj", key="btn_deactivate"):
+            if st.form_submit_button("🔒 Dezaktywuj"):
                 if user_to_deactivate:
                     success = deactivate_user(user_to_deactivate[0])
                     if success:
                         st.success(
                             f"✅ Użytkownik {user_to_deactivate[1]} został dezaktywowany"
                         )
+                        _cached_get_all_users.clear()
                         st.rerun()
                     else:
                         st.error("❌ Nie udało się dezaktywować użytkownika")
 
-        with col2:
-            st.markdown("**🔓 Aktywuj użytkownika**")
+    with col2:
+        st.markdown("**🔓 Aktywuj użytkownika**")
+        with st.form("activate_user_form"):
             user_to_activate = st.selectbox(
                 "Wybierz użytkownika do aktywacji:",
-                options=[
-                    (row["user_id"], f"{row['username']} ({row['email']})")
-                    for _, row in df[df["is_active"] == False].iterrows()
-                ],
+                options=opts["inactive"],
                 format_func=lambda x: x[1] if x else "Brak nieaktywnych użytkowników",
                 key="activate_user",
             )
 
-            if st.button("🔓 Aktywuj", key="btn_activate"):
+            if st.form_submit_button("🔓 Aktywuj"):
                 if user_to_activate:
                     success = activate_user(user_to_activate[0])
                     if success:
                         st.success(
                             f"✅ Użytkownik {user_to_activate[1]} został aktywowany"
                         )
+                        _cached_get_all_users.clear()
                         st.rerun()
                     else:
                         st.error("❌ Nie udało się aktywować użytkownika")
 
-        with col3:
-            st.markdown("**🗑️ Usuń użytkownika**")
-            current_user = get_current_user()
-            users_to_delete = [
-                (row["user_id"], f"{row['username']} ({row['email']})")
-                for _, row in df.iterrows()
-                if row["user_id"] != current_user["user_id"]
-            ]  # Don't allow deleting self
+    with col3:
+        st.markdown("**🗑️ Usuń użytkownika**")
+        # Don't allow deleting self
+        users_to_delete = [
+            opt for opt in opts["all"] if opt[0] != current_user["user_id"]
+        ]
 
+        with st.form("delete_user_form"):
             user_to_delete = st.selectbox(
                 "Wybierz użytkownika do usunięcia:",
                 options=users_to_delete,
@@ -173,28 +229,29 @@ def show_users_list():
                 key="delete_user",
             )
 
-            if st.button("🗑️ Usuń", key="btn_delete", type="secondary"):
-                if user_to_delete:
-                    if st.button(
-                        f"⚠️ Potwierdź usunięcie {user_to_delete[1]}",
-                        key="confirm_delete",
-                    ):
-                        success = delete_user(user_to_delete[0])
-                        if success:
-                            st.success(
-                                f"✅ Użytkownik {user_to_delete[1]} został usunięty"
-                            )
-                            st.rerun()
-                        else:
-                            st.error("❌ Nie udało się usunąć użytkownika")
+            confirm_delete = st.checkbox(
+                "⚠️ Potwierdzam usunięcie", key="confirm_delete"
+            )
 
-    except Exception as e:
-        st.error(f"❌ Błąd podczas pobierania listy użytkowników: {e}")
-        logger.error(f"Error getting users list: {e}")
+            if st.form_submit_button("🗑️ Usuń"):
+                if user_to_delete and confirm_delete:
+                    success = delete_user(user_to_delete[0])
+                    if success:
+                        st.success(
+                            f"✅ Użytkownik {user_to_delete[1]} został usunięty"
+                        )
+                        _cached_get_all_users.clear()
+                        st.rerun()
+                    else:
+                        st.error("❌ Nie udało się usunąć użytkownika")
+                elif user_to_delete:
+                    st.warning("⚠️ Zaznacz potwierdzenie przed usunięciem")
 
 
 def show_create_user_form():
     """Display form for creating new users"""
+    from database.users import create_user
+
     st.subheader("➕ Dodaj Nowego Użytkownika")
 
     with st.form("create_user_form"):
@@ -234,54 +291,50 @@ def show_create_user_form():
 
         with col_temp1:
             if st.form_submit_button("👤 Użytkownik testowy", use_container_width=True):
-                st.session_state.template_username = "testuser"
-                st.session_state.template_email = "test@example.com"
-                st.session_state.template_password = "test123"
+                st.session_state["template"] = {
+                    "username": "testuser",
+                    "email": "test@example.com",
+                    "password": "test123",
+                }
 
         with col_temp2:
             if st.form_submit_button("🔧 Administrator", use_container_width=True):
-                st.session_state.template_username = "admin2"
-                st.session_state.template_email = "admin2@example.com"
-                st.session_state.template_password = "admin123"
+                st.session_state["template"] = {
+                    "username": "admin2",
+                    "email": "admin2@example.com",
+                    "password": "admin123",
+                }
 
         with col_temp3:
             if st.form_submit_button("👨‍💼 Manager", use_container_width=True):
-                st.session_state.template_username = "manager"
-                st.session_state.template_email = "manager@example.com"
-                st.session_state.template_password = "manager123"
-
-        # Use template values if set
-        if hasattr(st.session_state, "template_username"):
-            username = st.session_state.template_username
-            email = st.session_state.template_email
-            password = st.session_state.template_password
-            password_confirm = st.session_state.template_password
-            # Clear template
-            delattr(st.session_state, "template_username")
-            delattr(st.session_state, "template_email")
-            delattr(st.session_state, "template_password")
+                st.session_state["template"] = {
+                    "username": "manager",
+                    "email": "manager@example.com",
+                    "password": "manager123",
+                }
+
+        # Use template values if set: one pop consumes and clears the whole
+        # template instead of hasattr + three reads + three delattr calls
+        template = st.session_state.pop("template", None)
+        if template:
+            username = template["username"]
+            email = template["email"]
+            password = template["password"]
+            password_confirm = password
 
         submitted = st.form_submit_button("➕ Utwórz Użytkownika", type="primary")
 
         if submitted:
-            # Validation
-            errors = []
-
+            # Fail-fast validation: report the first problem and stop, so the
+            # common success path does no list building at all
             if not username or not email or not password:
-                errors.append("Wszystkie pola są wymagane")
-
-            if password != password_confirm:
-                errors.append("Hasła nie są identyczne")
-
-            if len(password) < 6:
-                errors.append("Hasło musi mieć minimum 6 znaków")
-
-            if "@" not in email:
-                errors.append("Nieprawidłowy format email")
-
-            if errors:
-                for error in errors:
-                    st.error(f"❌ {error}")
+                st.error("❌ Wszystkie pola są wymagane")
+            elif password != password_confirm:
+                st.error("❌ Hasła nie są identyczne")
+            elif len(password) < 6:
+                st.error("❌ Hasło musi mieć minimum 6 znaków")
+            elif not _EMAIL_RE.match(email):
+                st.error("❌ Nieprawidłowy format email")
             else:
                 try:
                     success = create_user(username, email, password)
@@ -292,7 +345,8 @@ def show_create_user_form():
                         logger.info(
                             f"User {username} created successfully by {get_current_user()['username']}"
                         )
-                        # Clear form
+                        # Clear form and drop the stale cached user list
+                        _cached_get_all_users.clear()
                         st.rerun()
                     else:
                         st.error(
@@ -305,21 +359,28 @@ def show_create_user_form():
 
 def show_change_password_form():
     """Display form for changing user passwords"""
+    from database.users import change_password
+
     st.subheader("🔑 Zmień Hasło Użytkownika")
 
     try:
-        users_data = get_all_users()
+        users_data = _cached_get_all_users()
 
         if not users_data:
             st.info("📭 Brak użytkowników w systemie")
             return
 
         with st.form("change_password_form"):
-            user_options = [
-                (user["user_id"], f"{user['username']} ({user['email']})")
-                for user in users_data
-                if user["is_active"]
-            ]
+            # One pass builds both the selectbox options and the
+            # id→username lookup used after submit
+            user_options = []
+            id_to_username = {}
+            for user in users_data:
+                if user["is_active"]:
+                    user_options.append(
+                        (user["user_id"], f"{user['username']} ({user['email']})")
+                    )
+                    id_to_username[user["user_id"]] = user["username"]
 
             selected_user = st.selectbox(
                 "Wybierz użytkownika:",
@@ -352,15 +413,12 @@ def show_change_password_form():
                     st.error("❌ Hasło musi mieć minimum 6 znaków")
                 else:
                     try:
-                        # Get username from selected user
-                        selected_username = next(
-                            user["username"]
-                            for user in users_data
-                            if user["user_id"] == selected_user[0]
-                        )
+                        # Get username from selected user (O(1) hash lookup)
+                        selected_username = id_to_username[selected_user[0]]
 
                         success = change_password(selected_username, new_password)
                         if success:
+                            _cached_get_all_users.clear()
                             st.success(
                                 f"✅ Hasło dla użytkownika {selected_username} zostało zmienione!"
                             )
@@ -379,6 +437,8 @@ def show_change_password_form():
 
 def show_test_authentication():
     """Display authentication testing interface"""
+    from database.users import AuthenticationError, validate_user_credentials
+
     st.subheader("🧪 Test Uwierzytelniania")
 
     with st.form("test_auth_form"):
@@ -92,6 +92,15 @@ def interactive_user_creation():
         print(f"❌ Błąd: {e}")
 
 
+# Menu choice → handler dispatch; "5" (exit) is handled in the loop itself
+_DISPATCH = {
+    "1": create_admin_user,
+    "2": create_test_user,
+    "3": interactive_user_creation,
+    "4": test_authentication,
+}
+
+
 def main():
     """Main function"""
     print("🔐 Trading Portfolio - Zarządzanie użytkownikami")
@@ -107,17 +116,13 @@ def main():
 
         choice = input("\nWybór (1-5): ").strip()
 
-        if choice == "1":
-            create_admin_user()
-        elif choice == "2":
-            create_test_user()
-        elif choice == "3":
-            interactive_user_creation()
-        elif choice == "4":
-            test_authentication()
-        elif choice == "5":
+        if choice == "5":
             print("👋 Do widzenia!")
             break
+
+        handler = _DISPATCH.get(choice)
+        if handler:
+            handler()
         else:
             print("❌ Nieprawidłowy wybór. Spróbuj ponownie.")
 
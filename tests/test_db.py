@@ -1,80 +1,65 @@
 """Tests for database connection functionality."""
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 
-from database import get_db, get_db_engine, get_session
+from database import get_db, get_session
 
 
 class TestDatabaseConnection:
     """Test database connection using psycopg2."""
 
-    def test_should_connect_to_database_successfully(self):
+    @pytest.fixture(scope="class")
+    def conn(self):
+        """Open one psycopg2 connection for the whole class."""
+        conn = get_db()
+        yield conn
+        conn.close()
+        assert conn.closed != 0  # Connection should be closed
+
+    def test_should_connect_to_database_successfully(self, conn):
         """Test that psycopg2 connection is established successfully."""
-        conn = None
-        try:
-            conn = get_db()
-            assert conn is not None
-            assert conn.closed == 0  # 0 means open, non-zero means closed
-        finally:
-            if conn:
-                conn.close()
+        assert conn is not None
+        assert conn.closed == 0  # 0 means open, non-zero means closed
 
-    def test_should_execute_simple_query(self):
+    def test_should_execute_simple_query(self, conn):
         """Test that we can execute a simple query."""
-        conn = None
-        cursor = None
+        cursor = conn.cursor()
         try:
-            conn = get_db()
-            cursor = conn.cursor()
             cursor.execute("SELECT 1 as test_value")
             result = cursor.fetchone()
             assert result is not None
             assert result[0] == 1
         finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
-
-    def test_should_handle_connection_error_gracefully(self):
-        """Test that connection errors are handled properly."""
-        # This test verifies that attempting to use a closed connection raises an error
-        conn = get_db()
-        conn.close()
-        assert conn.closed != 0  # Connection should be closed
+            cursor.close()
+
 
 
 class TestDatabaseEngine:
     """Test database engine using SQLAlchemy."""
 
-    def test_should_create_engine_successfully(self):
-        """Test that SQLAlchemy engine is created successfully."""
-        engine = get_db_engine()
+    def test_should_connect_with_engine(self, engine):
+        """Test that the engine is created and can serve a connection."""
+        # Engine construction and connectivity are one behavior; a single
+        # SELECT 1 probe covers both without a separate creation test
         assert engine is not None
-
-    def test_should_connect_with_engine(self):
-        """Test that we can connect using the engine."""
-        engine = get_db_engine()
         with engine.connect() as connection:
             result = connection.execute(text("SELECT 1 as test_value"))
             row = result.fetchone()
             assert row is not None
             assert row[0] == 1
 
-    def test_should_verify_database_exists(self):
+    def test_should_verify_database_exists(self, engine):
         """Test that we can query database metadata."""
-        engine = get_db_engine()
         with engine.connect() as connection:
             result = connection.execute(text("SELECT current_database()"))
             db_name = result.fetchone()[0]
             assert db_name is not None
             assert isinstance(db_name, str)
 
-    def test_should_query_at_users_table_count(self):
+    def test_should_query_at_users_table_count(self, engine):
         """Test that we can query the number of records in at.users table."""
-        engine = get_db_engine()
         with engine.connect() as connection:
             result = connection.execute(text("SELECT COUNT(*) FROM at.users"))
             count = result.fetchone()[0]
@@ -82,9 +67,8 @@ class TestDatabaseEngine:
             assert isinstance(count, int)
             assert count >= 0
 
-    def test_should_list_database_schemas(self):
+    def test_should_list_database_schemas(self, engine):
         """Test that we can list all schemas in the database."""
-        engine = get_db_engine()
         with engine.connect() as connection:
             result = connection.execute(
                 text("""
@@ -98,9 +82,8 @@ class TestDatabaseEngine:
             assert len(schemas) > 0, "Expected at least one schema in the database"
             print(f"\nFound schemas: {schemas}")
 
-    def test_should_list_tables_in_schemas(self):
+    def test_should_list_tables_in_schemas(self, engine):
         """Test that we can list tables in each schema and verify each has tables."""
-        engine = get_db_engine()
         with engine.connect() as connection:
             # Get all user schemas
             schema_result = connection.execute(
@@ -162,15 +145,18 @@ class TestDatabaseSession:
             if session:
                 session.close()
 
-    def test_should_rollback_on_error(self):
+    def test_should_rollback_on_error(self, engine):
         """Test that session can rollback on error."""
+        # Check the missing table through the inspector instead of provoking
+        # a parse error on an unknown relation
+        assert not inspect(engine).has_table("nonexistent_table")
+
         session = None
         try:
             session = get_session()
-            # Try to execute an invalid query
+            # Force a cheap execution error to exercise the rollback path
             with pytest.raises(SQLAlchemyError):
-                session.execute(text("SELECT * FROM nonexistent_table"))
-                session.commit()
+                session.execute(text("SELECT 1/0"))
             # Session should still be usable after rollback
             session.rollback()
             result = session.execute(text("SELECT 1"))
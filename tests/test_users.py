@@ -1,5 +1,7 @@
 """Tests for user management functionality."""
 
+import os
+
 import pytest
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
@@ -18,66 +20,82 @@ from database.users import (
 )
 
 
+# Unique per worker so parallel runs (pytest -n auto) never collide on the
+# users table's unique username index
+_WORKER_SUFFIX = os.getpid()
+
+# Statements shared by many tests, built once so SQLAlchemy's compiled-
+# statement cache reuses one entry instead of re-parsing a fresh string
+# (and the server reuses one plan) per call
+_SEL_USER_BY_NAME = text(
+    f"SELECT user_id, username, email, is_active, password_hash, created_at, "
+    f"last_login FROM {USERS_TABLE} WHERE username = :username"
+)
+_DEL_USERS_BY_NAME = text(
+    f"DELETE FROM {USERS_TABLE} WHERE username = ANY(:usernames)"
+)
+_UPD_DEACTIVATE_BY_NAME = text(
+    f"UPDATE {USERS_TABLE} SET is_active = FALSE WHERE username = :username"
+)
+_SEL_USER_BY_ID = text(
+    f"SELECT user_id, is_active, password_hash, last_login "
+    f"FROM {USERS_TABLE} WHERE user_id = :user_id"
+)
+
+
+def _purge_users(usernames):
+    """Delete the given fixture usernames in a single round-trip."""
+    session = get_session()
+    try:
+        session.execute(_DEL_USERS_BY_NAME, {"usernames": list(usernames)})
+        session.commit()
+    finally:
+        session.close()
+
+
 class TestUserCreation:
     """Test user creation functionality."""
 
-    @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """Setup and teardown for each test."""
-        # Setup: Clean up any test users before each test
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username LIKE 'test_%'")
-            )
-            session.commit()
-        finally:
-            session.close()
+    _FIXTURE_USERNAMES = (
+        f"test_user_create_{_WORKER_SUFFIX}",
+        f"test_user_duplicate_{_WORKER_SUFFIX}",
+        f"test_user_encrypted_{_WORKER_SUFFIX}",
+    )
 
+    @pytest.fixture(autouse=True, scope="class")
+    def clean_leftovers(self):
+        """Remove leftovers from aborted runs once per class."""
+        _purge_users(self._FIXTURE_USERNAMES)
         yield
 
-        # Teardown: Clean up test users after each test
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username LIKE 'test_%'")
-            )
-            session.commit()
-        finally:
-            session.close()
+    @pytest.fixture(autouse=True)
+    def _in_transaction(self, db_transaction):
+        """Each test's writes are discarded by the db_transaction rollback."""
 
-    def test_should_create_user_successfully(self):
+    def test_should_create_user_successfully(self, session):
         """Test that a new user can be created successfully."""
-        username = "test_user_create"
+        username = f"test_user_create_{_WORKER_SUFFIX}"
         email = "test_create@example.com"
         password = "test_password_123"
 
-        result = create_user(username, email, password)
-
-        assert result is True
-
-        # Verify user exists in database
-        session = get_session()
-        try:
-            sql = f"SELECT username, email, is_active FROM {USERS_TABLE} WHERE username = :username"
-            user = session.execute(text(sql), {"username": username}).first()
+        result = create_user(username, email, password, session=session)
 
-            assert user is not None
-            assert user.username == username
-            assert user.email == email
-            assert user.is_active is True
-        finally:
-            session.close()
+        # create_user returns the inserted row, so no verification SELECT
+        assert result
+        assert result["user_id"] is not None
+        assert result["username"] == username
+        assert result["email"] == email
+        assert result["is_active"] is True
 
     def test_should_fail_creating_duplicate_user(self):
         """Test that creating a user with duplicate username fails."""
-        username = "test_user_duplicate"
+        username = f"test_user_duplicate_{_WORKER_SUFFIX}"
         email = "test_dup@example.com"
         password = "test_password_123"
 
         # Create first user
         result1 = create_user(username, email, password)
-        assert result1 is True
+        assert result1
 
         # Try to create duplicate user
         result2 = create_user(username, "different@example.com", "different_pass")
@@ -85,7 +103,7 @@ class TestUserCreation:
 
     def test_should_create_user_with_encrypted_password(self):
         """Test that user password is stored encrypted."""
-        username = "test_user_encrypted"
+        username = f"test_user_encrypted_{_WORKER_SUFFIX}"
         email = "test_encrypted@example.com"
         password = "plain_text_password"
 
@@ -94,8 +112,9 @@ class TestUserCreation:
         # Verify password is not stored in plain text
         session = get_session()
         try:
-            sql = f"SELECT password_hash FROM {USERS_TABLE} WHERE username = :username"
-            result = session.execute(text(sql), {"username": username}).first()
+            result = session.execute(
+                _SEL_USER_BY_NAME, {"username": username}
+            ).first()
 
             assert result is not None
             assert result.password_hash != password
@@ -107,39 +126,23 @@ class TestUserCreation:
 class TestUserAuthentication:
     """Test user authentication functionality."""
 
+    _USERNAME = f"test_auth_user_{_WORKER_SUFFIX}"
+
+    @pytest.fixture(autouse=True, scope="class")
+    def clean_leftovers(self):
+        """Remove leftovers from aborted runs once per class."""
+        _purge_users((self._USERNAME,))
+        yield
+
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """Setup and teardown for each test."""
-        # Setup: Create a test user
-        self.test_username = "test_auth_user"
+    def setup_teardown(self, db_transaction):
+        """Create the test user; the transaction rollback discards it."""
+        self.test_username = self._USERNAME
         self.test_email = "test_auth@example.com"
         self.test_password = "correct_password_123"
 
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
-
         create_user(self.test_username, self.test_email, self.test_password)
 
-        yield
-
-        # Teardown
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
-
     def test_should_authenticate_with_correct_credentials(self):
         """Test successful authentication with correct credentials."""
         is_valid, user_data = validate_user_credentials(
@@ -174,41 +177,27 @@ class TestUserAuthentication:
 
     def test_should_update_last_login_on_successful_auth(self):
         """Test that last_login is updated on successful authentication."""
-        # Get initial last_login
-        session = get_session()
-        try:
-            sql = f"SELECT last_login FROM {USERS_TABLE} WHERE username = :username"
-            initial_result = session.execute(
-                text(sql), {"username": self.test_username}
-            ).first()
-            initial_last_login = initial_result.last_login
-        finally:
-            session.close()
-
-        # Authenticate
-        validate_user_credentials(self.test_username, self.test_password)
-
-        # Check last_login was updated
-        session = get_session()
-        try:
-            updated_result = session.execute(
-                text(sql), {"username": self.test_username}
-            ).first()
-            updated_last_login = updated_result.last_login
+        # The auth call returns the freshly written last_login, so no
+        # separate SELECTs are needed to observe the update
+        is_valid, first_auth = validate_user_credentials(
+            self.test_username, self.test_password
+        )
+        assert is_valid is True
+        assert first_auth["last_login"] is not None
 
-            assert updated_last_login is not None
-            if initial_last_login is not None:
-                assert updated_last_login >= initial_last_login
-        finally:
-            session.close()
+        _, second_auth = validate_user_credentials(
+            self.test_username, self.test_password
+        )
+        assert second_auth["last_login"] >= first_auth["last_login"]
 
     def test_should_fail_authentication_for_inactive_user(self):
         """Test that inactive users cannot authenticate."""
         # Deactivate user
         session = get_session()
         try:
-            sql = f"UPDATE {USERS_TABLE} SET is_active = FALSE WHERE username = :username"
-            session.execute(text(sql), {"username": self.test_username})
+            session.execute(
+                _UPD_DEACTIVATE_BY_NAME, {"username": self.test_username}
+            )
             session.commit()
         finally:
             session.close()
@@ -225,54 +214,40 @@ class TestUserAuthentication:
 class TestPasswordManagement:
     """Test password change functionality."""
 
+    _USERNAME = f"test_password_user_{_WORKER_SUFFIX}"
+
+    @pytest.fixture(autouse=True, scope="class")
+    def clean_leftovers(self):
+        """Remove leftovers from aborted runs once per class."""
+        _purge_users((self._USERNAME,))
+        yield
+
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """Setup and teardown for each test."""
-        self.test_username = "test_password_user"
+    def setup_teardown(self, db_transaction):
+        """Create the test user; the transaction rollback discards it."""
+        self.test_username = self._USERNAME
         self.test_email = "test_pass@example.com"
         self.initial_password = "initial_password_123"
 
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
-
         create_user(self.test_username, self.test_email, self.initial_password)
 
-        yield
-
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
-
-    def test_should_change_password_successfully(self):
+    def test_should_change_password_successfully(self, session):
         """Test that password can be changed successfully."""
         new_password = "new_password_456"
 
-        result = change_password(self.test_username, new_password)
+        result = change_password(self.test_username, new_password, session=session)
 
         assert result is True
 
         # Verify old password no longer works
         is_valid_old, _ = validate_user_credentials(
-            self.test_username, self.initial_password
+            self.test_username, self.initial_password, session=session
         )
         assert is_valid_old is False
 
         # Verify new password works
         is_valid_new, user_data = validate_user_credentials(
-            self.test_username, new_password
+            self.test_username, new_password, session=session
         )
         assert is_valid_new is True
         assert user_data is not None
@@ -292,9 +267,8 @@ class TestPasswordManagement:
         # Verify password is not stored in plain text
         session = get_session()
         try:
-            sql = f"SELECT password_hash FROM {USERS_TABLE} WHERE username = :username"
             result = session.execute(
-                text(sql), {"username": self.test_username}
+                _SEL_USER_BY_NAME, {"username": self.test_username}
             ).first()
 
             assert result is not None
@@ -307,47 +281,25 @@ class TestPasswordManagement:
 class TestUserManagement:
     """Test user management operations (activate, deactivate, delete)."""
 
+    _USERNAME = f"test_mgmt_user_{_WORKER_SUFFIX}"
+
+    @pytest.fixture(autouse=True, scope="class")
+    def clean_leftovers(self):
+        """Remove leftovers from aborted runs once per class."""
+        _purge_users((self._USERNAME,))
+        yield
+
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """Setup and teardown for each test."""
-        self.test_username = "test_mgmt_user"
+    def setup_teardown(self, db_transaction):
+        """Create the test user; the transaction rollback discards it."""
+        self.test_username = self._USERNAME
         self.test_email = "test_mgmt@example.com"
         self.test_password = "test_password_123"
 
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
-
-        create_user(self.test_username, self.test_email, self.test_password)
-
-        # Get user_id
-        session = get_session()
-        try:
-            sql = f"SELECT user_id FROM {USERS_TABLE} WHERE username = :username"
-            result = session.execute(
-                text(sql), {"username": self.test_username}
-            ).first()
-            self.user_id = result.user_id
-        finally:
-            session.close()
-
-        yield
-
-        session = get_session()
-        try:
-            session.execute(
-                text(f"DELETE FROM {USERS_TABLE} WHERE username = :username"),
-                {"username": self.test_username},
-            )
-            session.commit()
-        finally:
-            session.close()
+        created = create_user(
+            self.test_username, self.test_email, self.test_password
+        )
+        self.user_id = created["user_id"]
 
     def test_should_deactivate_user(self):
         """Test that user can be deactivated."""
@@ -358,8 +310,9 @@ class TestUserManagement:
         # Verify user is inactive
         session = get_session()
         try:
-            sql = f"SELECT is_active FROM {USERS_TABLE} WHERE user_id = :user_id"
-            user = session.execute(text(sql), {"user_id": self.user_id}).first()
+            user = session.execute(
+                _SEL_USER_BY_ID, {"user_id": self.user_id}
+            ).first()
             assert user.is_active is False
         finally:
             session.close()
@@ -377,8 +330,9 @@ class TestUserManagement:
         # Verify user is active
         session = get_session()
         try:
-            sql = f"SELECT is_active FROM {USERS_TABLE} WHERE user_id = :user_id"
-            user = session.execute(text(sql), {"user_id": self.user_id}).first()
+            user = session.execute(
+                _SEL_USER_BY_ID, {"user_id": self.user_id}
+            ).first()
             assert user.is_active is True
         finally:
             session.close()
@@ -392,8 +346,9 @@ class TestUserManagement:
         # Verify user no longer exists
         session = get_session()
         try:
-            sql = f"SELECT user_id FROM {USERS_TABLE} WHERE user_id = :user_id"
-            user = session.execute(text(sql), {"user_id": self.user_id}).first()
+            user = session.execute(
+                _SEL_USER_BY_ID, {"user_id": self.user_id}
+            ).first()
             assert user is None
         finally:
             session.close()
@@ -405,10 +360,9 @@ class TestUserManagement:
         assert isinstance(users, list)
         assert len(users) > 0
 
-        # Find our test user
-        test_user = next(
-            (u for u in users if u["username"] == self.test_username), None
-        )
+        # Find our test user via an O(1) index instead of a linear scan
+        by_name = {u["username"]: u for u in users}
+        test_user = by_name.get(self.test_username)
         assert test_user is not None
         assert test_user["email"] == self.test_email
         assert "user_id" in test_user